@@ -8,25 +8,6 @@ It handles audio input/output and manages the conversation lifecycle.
 
 import os
 import argparse
-import logging
-from rich.console import Console
-from rich.logging import RichHandler
-
-from src.gavin_the_fish.conversation import GavinConversation
-from src.gavin_the_fish.config import settings
-
-# Set up rich console
-console = Console()
-
-def setup_logging(debug=False):
-    """Set up logging with rich handler."""
-    level = logging.DEBUG if debug else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format="%(message)s",
-        datefmt="[%X]",
-        handlers=[RichHandler(rich_tracebacks=True, console=console)]
-    )
 
 def main():
     """Run the conversation."""
@@ -37,7 +18,15 @@ def main():
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     args = parser.parse_args()
     
-    # Set up logging
+    # Import heavy dependencies only once we know they're needed
+    from src.gavin_the_fish import install_rich_tracebacks
+    from src.gavin_the_fish.logging_setup import get_console, setup_logging
+    from src.gavin_the_fish.conversation import GavinConversation
+    from src.gavin_the_fish.config import settings
+    
+    # Set up rich console, tracebacks and logging
+    console = get_console()
+    install_rich_tracebacks(console)
     setup_logging(args.debug)
     
     # Get agent ID and API key from arguments or environment
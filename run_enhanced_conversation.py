@@ -8,32 +8,44 @@ and provides a simple visualization of the audio levels.
 
 import os
 import argparse
-import logging
-import time
-import threading
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.progress import Progress, BarColumn, TextColumn
 
-from src.gavin_the_fish.conversation import GavinConversation
-from src.gavin_the_fish.custom_audio_interface import CustomAudioInterface
-from src.gavin_the_fish.config import settings
+# Volume meter, created on first use and reused across conversations
+_progress = None
 
-# Set up rich console
-console = Console()
+def _get_progress(console):
+    """Get the shared volume meter, creating it on first use.
 
-def setup_logging(debug=False):
-    """Set up logging with rich handler."""
-    level = logging.DEBUG if debug else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format="%(message)s",
-        datefmt="[%X]",
-        handlers=[RichHandler(rich_tracebacks=True, console=console)]
-    )
+    The meter pulls the level from its volume_source each time Rich's refresh
+    thread redraws it, so the audio callback never touches Rich.
+    """
+    global _progress
+    if _progress is None:
+        from rich.progress import Progress, BarColumn, TextColumn
+
+        class VolumeMeter(Progress):
+            volume_source = None
+
+            def get_renderables(self):
+                if self.volume_source is not None:
+                    completed = self.volume_source() * 100
+                    for task_id in self.task_ids:
+                        self.update(task_id, completed=completed)
+                yield from super().get_renderables()
 
-def list_audio_devices():
+        _progress = VolumeMeter(
+            TextColumn("[bold blue]Volume:[/bold blue]"),
+            BarColumn(bar_width=40),
+            TextColumn("[bold]{task.percentage:.0f}%[/bold]"),
+            console=console,
+            transient=True,
+            refresh_per_second=15
+        )
+    return _progress
+
+def list_audio_devices(console):
     """List available audio devices."""
+    from src.gavin_the_fish.custom_audio_interface import CustomAudioInterface
+
     devices = CustomAudioInterface.list_audio_devices()
     
     console.print("\n[bold cyan]Available Audio Devices:[/bold cyan]")
@@ -60,17 +72,28 @@ def main():
     parser.add_argument("--input-device", type=int, help="Input device index")
     parser.add_argument("--output-device", type=int, help="Output device index")
     parser.add_argument("--list-devices", action="store_true", help="List available audio devices")
+    parser.add_argument("--low-latency", action="store_true", help="Use low-latency sounddevice streams (requires sounddevice)")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     args = parser.parse_args()
     
-    # Set up logging
+    # Set up rich console and logging
+    from src.gavin_the_fish import install_rich_tracebacks
+    from src.gavin_the_fish.logging_setup import get_console, setup_logging
+    
+    console = get_console()
+    install_rich_tracebacks(console)
     setup_logging(args.debug)
     
     # List audio devices if requested
     if args.list_devices:
-        list_audio_devices()
+        list_audio_devices(console)
         return 0
     
+    # Import the conversation stack only when starting a conversation
+    from src.gavin_the_fish.conversation import GavinConversation
+    from src.gavin_the_fish.custom_audio_interface import CustomAudioInterface, SoundDeviceAudioInterface
+    from src.gavin_the_fish.config import settings
+    
     # Get agent ID and API key from arguments or environment
     agent_id = args.agent_id or settings.ELEVENLABS_AGENT_ID
     api_key = args.api_key or settings.ELEVENLABS_API_KEY
@@ -81,15 +104,19 @@ def main():
                      "Please provide it via --agent-id or set ELEVENLABS_AGENT_ID in .env")
         return 1
     
-    # Create audio interface with volume visualization
-    current_volume = 0.0
+    # Volume meter; the audio callback only stores the level, Rich's refresh thread draws it
+    progress = _get_progress(console)
+    task = progress.add_task("", total=100)
+    volume_level = [0.0]
     
     def update_volume(volume):
-        nonlocal current_volume
-        current_volume = volume
+        volume_level[0] = volume
+    
+    progress.volume_source = lambda: volume_level[0]
     
     # Create audio interface
-    audio_interface = CustomAudioInterface(
+    audio_interface_class = SoundDeviceAudioInterface if args.low_latency else CustomAudioInterface
+    audio_interface = audio_interface_class(
         input_device_index=args.input_device,
         output_device_index=args.output_device,
         on_volume_change=update_volume
@@ -108,25 +135,8 @@ def main():
         console.print("\n[bold cyan]Starting enhanced conversation with Gavin the Fish[/bold cyan]")
         console.print("Speak after the tone, or press Ctrl+C to end the conversation\n")
         
-        # Start volume visualization in a separate thread
-        stop_visualization = threading.Event()
-        
-        def run_visualization():
-            with Progress(
-                TextColumn("[bold blue]Volume:[/bold blue]"),
-                BarColumn(bar_width=40),
-                TextColumn("[bold]{task.percentage:.0f}%[/bold]"),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("", total=100)
-                while not stop_visualization.is_set():
-                    progress.update(task, completed=current_volume * 100)
-                    time.sleep(0.05)
-        
-        visualization_thread = threading.Thread(target=run_visualization)
-        visualization_thread.daemon = True
-        visualization_thread.start()
+        # Show the volume meter
+        progress.start()
         
         # Start conversation
         conversation.start_conversation()
@@ -134,24 +144,23 @@ def main():
         # Wait for conversation to end
         conversation_id = conversation.wait_for_conversation_end()
         
-        # Stop visualization
-        stop_visualization.set()
-        visualization_thread.join(timeout=1.0)
+        # Hide the volume meter
+        progress.stop()
         
         if conversation_id:
             console.print(f"\n[bold green]Conversation ended.[/bold green] ID: {conversation_id}")
         
     except KeyboardInterrupt:
         console.print("\n[bold yellow]Conversation interrupted by user[/bold yellow]")
-        stop_visualization.set() if 'stop_visualization' in locals() else None
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {str(e)}")
-        stop_visualization.set() if 'stop_visualization' in locals() else None
         return 1
     finally:
-        # Clean up audio interface
-        if 'audio_interface' in locals():
-            audio_interface.cleanup()
+        # Close the audio streams first, then stop the volume meter
+        audio_interface.cleanup()
+        progress.stop()
+        progress.remove_task(task)
+        progress.volume_source = None
     
     return 0
 
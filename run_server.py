@@ -1,11 +1,23 @@
-from gavin_the_fish.server import app
+import argparse
 import uvicorn
 
+APP = "gavin_the_fish.server:app"
+HOST = "0.0.0.0"
+PORT = 8000
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "gavin_the_fish.server:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,  # Enable hot reloading
-        reload_dirs=["src/gavin_the_fish"]  # Only watch the src directory
-    ) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the Gavin the Fish API server")
+    parser.add_argument("--dev", action="store_true", help="Enable hot reloading for development")
+    args = parser.parse_args()
+
+    if args.dev:
+        uvicorn.run(
+            APP,
+            host=HOST,
+            port=PORT,
+            reload=True,  # Enable hot reloading
+            reload_dirs=["src/gavin_the_fish"],  # Only watch the src directory
+            reload_includes=["*.py"]  # Ignore logs and other non-source files
+        )
+    else:
+        uvicorn.run(APP, host=HOST, port=PORT)
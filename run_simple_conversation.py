@@ -8,29 +8,9 @@ It uses a simplified approach that doesn't require PyAudio.
 
 import os
 import argparse
-import logging
 import signal
-import sys
-from rich.console import Console
-from rich.logging import RichHandler
-
-from elevenlabs.client import ElevenLabs
-from elevenlabs.conversational_ai.conversation import Conversation
-
-from src.gavin_the_fish.config import settings
-
-# Set up rich console
-console = Console()
-
-def setup_logging(debug=False):
-    """Set up logging with rich handler."""
-    level = logging.DEBUG if debug else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format="%(message)s",
-        datefmt="[%X]",
-        handlers=[RichHandler(rich_tracebacks=True, console=console)]
-    )
+import socket
+import threading
 
 def main():
     """Run the simple conversation."""
@@ -41,7 +21,16 @@ def main():
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     args = parser.parse_args()
     
-    # Set up logging
+    # Import heavy dependencies only once we know they're needed
+    from elevenlabs.client import ElevenLabs
+    from elevenlabs.conversational_ai.conversation import Conversation
+    from src.gavin_the_fish import install_rich_tracebacks
+    from src.gavin_the_fish.logging_setup import get_console, setup_logging
+    from src.gavin_the_fish.config import settings
+    
+    # Set up rich console, tracebacks and logging
+    console = get_console()
+    install_rich_tracebacks(console)
     setup_logging(args.debug)
     
     # Get agent ID and API key from arguments or environment
@@ -84,20 +73,47 @@ def main():
             callback_user_transcript=on_user_transcript,
         )
         
-        # Set up signal handler for clean shutdown
-        def handle_interrupt(sig, frame):
-            console.print("\n[bold yellow]Ending conversation...[/bold yellow]")
-            conversation.end_session()
-            sys.exit(0)
-        
-        signal.signal(signal.SIGINT, handle_interrupt)
+        # Ctrl+C only wakes the main thread through the wakeup fd; the
+        # session teardown never runs inside the signal handler
+        wake_r, wake_w = socket.socketpair()
+        wake_w.setblocking(False)
+        signal.set_wakeup_fd(wake_w.fileno())
+        signal.signal(signal.SIGINT, lambda sig, frame: None)
         
         # Start conversation
         console.print("[bold]Starting session...[/bold]")
         conversation.start_session()
         
-        # Wait for conversation to end
+        # Also wake the main thread if the session ends on its own
+        session_ended = threading.Event()
+        
+        def notify_session_end():
+            conversation.wait_for_session_end()
+            session_ended.set()
+            try:
+                wake_w.send(b"\0")
+            except OSError:
+                # The main thread already woke up and closed the socket
+                pass
+        
+        notifier = threading.Thread(target=notify_session_end, daemon=True)
+        notifier.start()
+        
+        # Wait for Ctrl+C or the end of the session
+        try:
+            wake_r.recv(1)
+        finally:
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            signal.set_wakeup_fd(-1)
+        
+        # On Ctrl+C, tear down the session on the main thread
+        if not session_ended.is_set():
+            console.print("\n[bold yellow]Ending conversation...[/bold yellow]")
+            conversation.end_session()
         conversation_id = conversation.wait_for_session_end()
+        notifier.join(timeout=1)
+        wake_r.close()
+        wake_w.close()
         
         console.print(f"\n[bold green]Conversation ended.[/bold green] ID: {conversation_id}")
         
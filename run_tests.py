@@ -7,11 +7,10 @@ This script ensures the server is running before running the tests.
 
 import os
 import sys
-import time
+import select
 import subprocess
 import argparse
 import signal
-import httpx
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -22,35 +21,52 @@ SERVER_URL = "http://localhost:8000"
 API_KEY = os.getenv("API_KEY")
 SERVER_STARTUP_TIMEOUT = 10  # seconds
 
-def is_server_running():
-    """Check if the server is running."""
-    try:
-        response = httpx.get(
-            f"{SERVER_URL}/jobs",
+# HTTP client reused across server checks, created on first use
+_probe = None
+
+def _get_probe():
+    """Get the shared HTTP client used to check the server."""
+    global _probe
+    if _probe is None:
+        import httpx
+
+        _probe = httpx.Client(
+            base_url=SERVER_URL,
             headers={"X-API-Key": API_KEY},
             timeout=2
         )
-        return response.status_code == 200
+    return _probe
+
+def is_server_running():
+    """Check if the server is running."""
+    try:
+        return _get_probe().get("/jobs").status_code == 200
     except Exception:
         return False
 
 def start_server():
     """Start the server in a subprocess."""
     print("Starting server...")
+    # The server writes a byte to this pipe once startup has completed
+    read_fd, write_fd = os.pipe()
     server_process = subprocess.Popen(
         ["python", "-m", "src.gavin_the_fish.server"],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        preexec_fn=os.setsid  # Create a new process group
+        start_new_session=True,  # Create a new process group
+        pass_fds=(write_fd,),
+        env={**os.environ, "READY_FD": str(write_fd)}
     )
+    os.close(write_fd)
     
-    # Wait for the server to start
-    start_time = time.time()
-    while time.time() - start_time < SERVER_STARTUP_TIMEOUT:
-        if is_server_running():
+    # Wait for the server to signal readiness (EOF means it exited early)
+    try:
+        ready, _, _ = select.select([read_fd], [], [], SERVER_STARTUP_TIMEOUT)
+        if ready and os.read(read_fd, 1):
             print("Server is running.")
             return server_process
-        time.sleep(0.5)
+    finally:
+        os.close(read_fd)
     
     # If we get here, the server didn't start
     print("Failed to start server.")
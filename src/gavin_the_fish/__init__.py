@@ -1,6 +1,10 @@
-from rich.traceback import install
-from rich.console import Console
+def install_rich_tracebacks(console=None):
+    """Install the Rich traceback handler.
 
-# Initialize Rich console and install traceback handler before any other imports
-console = Console()
-install(show_locals=False, width=console.width)
+    Called explicitly by entry points so importing the package stays cheap.
+    """
+    from rich.traceback import install
+    from .logging_setup import get_console
+
+    console = console or get_console()
+    install(show_locals=False, width=console.width)
@@ -5,47 +5,103 @@ This module provides functionality for managing the ElevenLabs agent
 and updating its configuration.
 """
 
+import functools
+import hashlib
 import logging
 from typing import Dict, Optional
-from rich.console import Console
+import httpx
 from .config import settings
 import json
 from pathlib import Path
-from elevenlabs import ElevenLabs
 
-# Initialize logger and console
+# Initialize logger
 logger = logging.getLogger(__name__)
-console = Console()
 
-if not settings.ELEVENLABS_API_KEY or not settings.ELEVENLABS_AGENT_ID:
-    logger.error("Missing ElevenLabs API key or agent ID")
-    raise ValueError("Missing ElevenLabs API key or agent ID")
+def _check_credentials():
+    """Raise if the ElevenLabs API key or agent ID is not configured."""
+    if not settings.ELEVENLABS_API_KEY or not settings.ELEVENLABS_AGENT_ID:
+        logger.error("Missing ElevenLabs API key or agent ID")
+        raise ValueError("Missing ElevenLabs API key or agent ID")
 
-# Initialize ElevenLabs client and agent
-client = ElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
-agent = client.conversational_ai.get_agent(settings.ELEVENLABS_AGENT_ID)
+# Shared HTTP client for agent updates, created on first use so the
+# connection to the ElevenLabs API is kept alive between updates
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Digest of the last payload successfully pushed to the agent
+_last_payload_digest: Optional[str] = None
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it if needed."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _check_credentials()
+        _http_client = httpx.AsyncClient(
+            base_url=settings.ELEVENLABS_API_BASE_URL,
+            headers={"xi-api-key": settings.ELEVENLABS_API_KEY},
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=300),
+            timeout=30.0
+        )
+    return _http_client
+
+async def close_http_client():
+    """Close the shared HTTP client if it was created."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> Dict:
+    """Load a JSON config file, cached until its mtime or size changes."""
+    return json.loads(Path(path).read_bytes())
 
 async def update_agent_tools():
-    """Update the ElevenLabs agent with the configuration from agent_config.json."""
-        
+    """Update the ElevenLabs agent with the configuration from agent_config.json.
+
+    The PATCH is skipped when the payload matches the last one pushed.
+    """
+    global _last_payload_digest
+
     # Read the agent config file
     config_file = Path("agent_config.json")
-    if not config_file.exists():
+    try:
+        stat = config_file.stat()
+    except FileNotFoundError:
         logger.error("agent_config.json not found")
         return
-        
-    with config_file.open() as f:
-        config = json.load(f)
-        
+
+    config = _load_config_cached(str(config_file), stat.st_mtime_ns, stat.st_size)
+
     logger.info(f"Found config with {len(config['conversation_config']['agent']['prompt']['tools'])} tools")
-    
+
+    # The agent ID goes in the URL, everything else is the PATCH body
+    agent_id = config.get("agent_id") or settings.ELEVENLABS_AGENT_ID
+    payload = {k: v for k, v in config.items() if k != "agent_id"}
+
+    # Serialize once; the same bytes are hashed and sent as the request body
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    hasher = hashlib.blake2b(agent_id.encode(), digest_size=16)
+    hasher.update(body)
+    digest = hasher.hexdigest()
+
+    # Skip the round trip if nothing changed since the last update
+    if digest == _last_payload_digest:
+        logger.info("Agent config unchanged, skipping update")
+        return
+
     try:
-        # Update the agent using the SDK
-        updated_agent = client.conversational_ai.update_agent(**config)
+        # Patch the agent over the shared connection
+        response = await _get_http_client().patch(
+            f"/convai/agents/{agent_id}",
+            content=body,
+            headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+        _last_payload_digest = digest
         # logger.info("Successfully patched agent with config")
         # with open("current_agent_config.json", "w")  as f:
-        #     f.write(updated_agent.json())
-        
+        #     f.write(response.text)
+
     except Exception as e:
         logger.error(f"Failed to patch agent: {str(e)}")
-        raise 
\ No newline at end of file
+        raise
@@ -4,6 +4,7 @@ class Settings(BaseSettings):
     API_KEY: str = "your-secret-api-key-here"  # Change this to a secure random string
     API_KEY_HEADER: str = "X-API-Key"
     LOG_FILE: str = "logs/requests.log"  # Default log file path
+    LOG_VERBOSE: bool = True  # Print a Rich request summary to the terminal
     
     # ElevenLabs Configuration
     ELEVENLABS_API_KEY: str = ""
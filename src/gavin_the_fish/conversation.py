@@ -52,9 +52,9 @@ class GavinConversation:
         # Initialize ElevenLabs client
         self.client = ElevenLabs(api_key=self.api_key)
 
-        # Set up logging
+        # Enable debug logging for this package only; handlers are left to the entry point
         if self.debug:
-            logging.basicConfig(level=logging.DEBUG)
+            logging.getLogger(__name__.rpartition(".")[0]).setLevel(logging.DEBUG)
 
     def _on_agent_response(self, response: str):
         """Handle agent responses with simple logging."""
@@ -79,7 +79,7 @@ class GavinConversation:
             callback_user_transcript=lambda transcript: logger.info(f"User: {transcript}"),
 
             # Latency measurements if debug is enabled
-            callback_latency_measurement=lambda latency: logger.debug(f"Latency: {latency}ms") if self.debug else None,
+            callback_latency_measurement=(lambda latency: logger.debug("Latency: %sms", latency)) if self.debug else None,
         )
 
     def start_conversation(self):
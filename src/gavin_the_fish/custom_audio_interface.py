@@ -4,8 +4,11 @@ Custom audio interface implementations for the Gavin the Fish system.
 This module provides custom audio interface implementations for use with the ElevenLabs SDK.
 """
 
+import ctypes
 import logging
-import queue
+import math
+import os
+import sys
 import threading
 import time
 from typing import Optional, Callable, Dict, Any, List
@@ -17,6 +20,84 @@ from elevenlabs.conversational_ai.conversation import AudioInterface
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Number of input chunks buffered between the audio callback and read_audio
+# (must be a power of two)
+RING_SLOTS = 8
+
+# Number of output chunks kept for echo suppression, and how long after the
+# last playback they still count as a possible echo source
+RECENT_OUTPUT_CHUNKS = 5
+ECHO_TAIL_SECONDS = 0.5
+
+# Seconds of audio the output ring holds before play_audio has to wait
+OUTPUT_RING_SECONDS = 4
+
+# Shared PyAudio handle for device queries, created on first use
+_pyaudio = None
+_pyaudio_lock = threading.Lock()
+
+def _get_pyaudio() -> "pyaudio.PyAudio":
+    """Get the shared PyAudio handle used for device queries."""
+    global _pyaudio
+    with _pyaudio_lock:
+        if _pyaudio is None:
+            _pyaudio = pyaudio.PyAudio()
+        return _pyaudio
+
+# Tracks which audio threads have already had their priority raised
+_audio_thread_state = threading.local()
+
+def _elevate_audio_priority() -> None:
+    """Raise the calling audio thread to real-time priority, once per thread.
+
+    Best effort: failures (usually missing privileges) are logged and the
+    thread keeps its normal priority.
+    """
+    if getattr(_audio_thread_state, "elevated", False):
+        return
+    _audio_thread_state.elevated = True
+
+    try:
+        if sys.platform.startswith("linux"):
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+            except PermissionError:
+                os.nice(-10)
+        elif sys.platform == "darwin":
+            QOS_CLASS_USER_INTERACTIVE = 0x21
+            ctypes.CDLL(None).pthread_set_qos_class_self_np(QOS_CLASS_USER_INTERACTIVE, 0)
+        elif sys.platform == "win32":
+            task_index = ctypes.c_ulong(0)
+            ctypes.windll.avrt.AvSetMmThreadCharacteristicsW("Pro Audio", ctypes.byref(task_index))
+        logger.debug("Raised audio thread priority")
+    except Exception as e:
+        logger.debug(f"Could not raise audio thread priority: {e}")
+
+def _sum_of_squares(samples: np.ndarray) -> int:
+    """Sum of squares of int16 samples, accumulated in int64 without a widened copy."""
+    return int(np.einsum('i,i->', samples, samples, dtype=np.int64))
+
+def _normalized_rms(sum_squares: int, count: int) -> float:
+    """Convert a sum of squares of int16 samples to an RMS level in 0.0-1.0."""
+    if sum_squares <= 0:
+        return 0.0
+    return min(1.0, math.sqrt(sum_squares / count) / 32767.0)
+
+def _attenuate(samples: np.ndarray, gain_q15: int, scratch: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Scale int16 samples by a Q15 fixed-point gain into a preallocated buffer.
+
+    The product is formed in the int32 ``scratch`` buffer so no temporary
+    arrays are allocated.
+    """
+    np.multiply(samples, gain_q15, out=scratch, dtype=np.int32)
+    np.right_shift(scratch, 15, out=scratch)
+    out[:] = scratch
+    return out
+
+def _gain_q15(attenuation: float) -> int:
+    """Convert an attenuation factor (0.0-1.0) to a Q15 fixed-point gain."""
+    return int(round((1.0 - attenuation) * 32768))
+
 class CustomAudioInterface(AudioInterface):
     """
     Custom audio interface implementation with additional features.
@@ -41,9 +122,9 @@ class CustomAudioInterface(AudioInterface):
     def stop(self) -> None:
         """Stop the audio interface (required abstract method)."""
         self.stop_recording()
-        if self.output_stream and self.output_stream.is_active():
+        if self.output_stream and self._output_is_active():
             try:
-                self.output_stream.stop_stream()
+                self._stop_output_stream()
             except Exception as e:
                 logger.error(f"Error stopping output stream: {e}")
 
@@ -55,14 +136,10 @@ class CustomAudioInterface(AudioInterface):
 
     def interrupt(self) -> None:
         """Interrupt audio processing (required abstract method)."""
-        # Stop any ongoing audio playback
-        if self.output_stream and self.is_playing and self.output_stream.is_active():
-            try:
-                self.output_stream.stop_stream()
-            except Exception as e:
-                logger.error(f"Error interrupting output stream: {e}")
-            finally:
-                self.is_playing = False
+        # Drop any queued playback; the output callback skips past it and
+        # plays silence until new audio arrives
+        self._out_discard_to = self._out_tail
+        self.is_playing = False
 
     def __init__(
         self,
@@ -83,7 +160,10 @@ class CustomAudioInterface(AudioInterface):
             sample_rate: Sample rate to use for audio.
             channels: Number of channels to use for audio.
             chunk_size: Chunk size to use for audio processing.
-            format_type: Format type to use for audio.
+            format_type: Format type to use for audio. The ElevenLabs SDK sends and
+                expects 16-bit PCM and echo suppression works on int16 samples,
+                so narrower formats would halve buffer sizes but corrupt the
+                audio exchanged with the agent.
             on_volume_change: Callback for volume level changes.
         """
         self.input_device_index = input_device_index
@@ -92,23 +172,50 @@ class CustomAudioInterface(AudioInterface):
         self.channels = channels
         self.chunk_size = chunk_size
         self.format_type = format_type
+        self._sample_bytes = pyaudio.get_sample_size(format_type)
         self.on_volume_change = on_volume_change
 
         # Audio processing state
         self.p = None
         self.input_stream = None
         self.output_stream = None
-        self.audio_queue = queue.Queue()
+        # Preallocated single-producer/single-consumer ring of input chunks.
+        # The audio callback only advances _head and read_audio only advances
+        # _tail; the GIL makes each slot copy atomic.
+        self._ring = [bytearray(chunk_size * channels * self._sample_bytes) for _ in range(RING_SLOTS)]
+        self._ring_lens = [0] * RING_SLOTS
+        self._head = 0
+        self._tail = 0
+        self._data_ready = threading.Event()
+        self._silence = bytes(chunk_size * channels * self._sample_bytes)
         self.is_recording = False
         self.is_playing = False
         self.current_volume = 0.0
         self.input_callback = None
 
         # Echo suppression parameters
-        self.recent_output_audio = []
+        self._recent_output = np.zeros((RECENT_OUTPUT_CHUNKS, chunk_size * channels), dtype=np.int16)
+        self._recent_output_idx = 0
+        self._last_play_ts = 0.0
         self.echo_suppression_enabled = True
         self.noise_gate_threshold = 0.02  # Minimum volume to consider as actual speech
+        self._gate_ss_per_sample = (self.noise_gate_threshold * 32767.0) ** 2
         self.echo_attenuation = 0.7       # How much to attenuate detected echo
+        self._gain_q15 = _gain_q15(self.echo_attenuation)
+
+        # Preallocated output ring drained by the output stream callback.
+        # play_audio only advances _out_tail and the callback only advances
+        # _out_head; both are running byte counts.
+        self._out_ring = bytearray(sample_rate * channels * self._sample_bytes * OUTPUT_RING_SECONDS)
+        self._out_head = 0
+        self._out_tail = 0
+        self._out_discard_to = 0
+        self._out_space = threading.Event()
+
+        # Preallocated output and scratch buffers for attenuated input chunks.
+        # The output array is a view of a bytearray so attenuated chunks can
+        # be handed on without a tobytes() copy.
+        self._resize_gate_buffers(chunk_size * channels)
 
         # Initialize PyAudio
         self.p = pyaudio.PyAudio()
@@ -119,65 +226,9 @@ class CustomAudioInterface(AudioInterface):
             return
 
         def callback(in_data, frame_count, time_info, status):  # pylint: disable=unused-argument
+            _elevate_audio_priority()
             if self.is_recording:
-                # Convert input to numpy array for processing
-                audio_data = np.frombuffer(in_data, dtype=np.int16)
-                processed_data = in_data  # Default to original data
-
-                # Apply echo suppression if enabled and we're playing audio
-                if self.echo_suppression_enabled and self.is_playing and len(self.recent_output_audio) > 0:
-                    try:
-                        # Simple echo suppression: apply noise gate during playback
-                        # Calculate volume level
-                        if len(audio_data) > 0:
-                            mean_square = np.mean(np.square(audio_data))
-                            if mean_square > 0:
-                                rms = np.sqrt(mean_square)
-                                normalized_rms = min(1.0, rms / 32767.0)  # Normalize to 0.0-1.0
-
-                                # Apply noise gate - only pass audio if it's louder than threshold
-                                # This helps distinguish between echo and actual user speech
-                                if normalized_rms < self.noise_gate_threshold:
-                                    # Likely echo or background noise, attenuate it
-                                    audio_data = (audio_data * (1.0 - self.echo_attenuation)).astype(np.int16)
-                                else:
-                                    # Likely actual speech, keep it
-                                    logger.debug(f"Detected potential user interruption: volume={normalized_rms}")
-
-                        processed_data = audio_data.tobytes()
-                    except Exception as e:
-                        logger.error(f"Error in echo suppression: {e}")
-                        processed_data = in_data  # Fallback to original data
-
-                # Put processed audio in queue
-                self.audio_queue.put(processed_data)
-
-                # Calculate volume level (RMS) for visualization
-                if self.on_volume_change:
-                    # We already have audio_data from above
-                    if not isinstance(audio_data, np.ndarray):
-                        audio_data = np.frombuffer(in_data, dtype=np.int16)
-
-                    # Check for empty or invalid audio data to prevent warnings
-                    if len(audio_data) > 0:
-                        # Use a small epsilon to avoid sqrt of zero
-                        mean_square = np.mean(np.square(audio_data))
-                        if mean_square > 0:
-                            rms = np.sqrt(mean_square)
-                            normalized_rms = min(1.0, rms / 32767.0)  # Normalize to 0.0-1.0
-                            self.current_volume = normalized_rms
-                            self.on_volume_change(normalized_rms)
-                        else:
-                            self.current_volume = 0.0
-                            self.on_volume_change(0.0)
-                    else:
-                        self.current_volume = 0.0
-                        self.on_volume_change(0.0)
-
-                # Call the input callback if provided
-                if self.input_callback:
-                    self.input_callback(processed_data)
-
+                self._process_input(in_data)
             return (in_data, pyaudio.paContinue)
 
         self.input_stream = self.p.open(
@@ -193,6 +244,65 @@ class CustomAudioInterface(AudioInterface):
         self.is_recording = True
         logger.debug("Started recording")
 
+    def _process_input(self, in_data: bytes) -> None:
+        """Apply echo suppression to an input chunk and hand it to the consumers."""
+        # Convert input to numpy array for processing
+        audio_data = np.frombuffer(in_data, dtype=np.int16)
+        processed_data = in_data  # Default to original data
+
+        # Calculate the sum of squares once; it drives both the
+        # noise gate and the volume callback
+        sum_squares = _sum_of_squares(audio_data) if len(audio_data) > 0 else 0
+
+        # Apply echo suppression if enabled and we're playing audio
+        if (self.echo_suppression_enabled and self.is_playing and self._recent_output_idx > 0
+                and time.monotonic() - self._last_play_ts <= ECHO_TAIL_SECONDS):
+            try:
+                # Simple echo suppression: apply noise gate during playback
+                if sum_squares > 0:
+                    # Apply noise gate - only pass audio if it's louder than threshold
+                    # This helps distinguish between echo and actual user speech.
+                    # Compared as a sum of squares so no sqrt is needed.
+                    if sum_squares < self._gate_ss_per_sample * len(audio_data):
+                        # Likely echo or background noise, attenuate it
+                        size = len(audio_data)
+                        if size > len(self._out_buf):
+                            # Streams without a fixed block size can deliver larger chunks
+                            self._resize_gate_buffers(size)
+                        audio_data = _attenuate(audio_data, self._gain_q15,
+                                                self._scratch_i32[:size], self._out_buf[:size])
+                        processed_data = memoryview(self._out_bytes)[:audio_data.nbytes]
+                    elif logger.isEnabledFor(logging.DEBUG):
+                        # Likely actual speech, keep it
+                        logger.debug("Detected potential user interruption: volume=%s",
+                                     _normalized_rms(sum_squares, len(audio_data)))
+            except Exception as e:
+                logger.error(f"Error in echo suppression: {e}")
+                processed_data = in_data  # Fallback to original data
+
+        # Put processed audio in the ring
+        self._ring_push(processed_data)
+
+        # Report the volume level (RMS) for visualization
+        if self.on_volume_change:
+            normalized_rms = _normalized_rms(sum_squares, len(audio_data))
+            self.current_volume = normalized_rms
+            self.on_volume_change(normalized_rms)
+
+        # Call the input callback if provided
+        if self.input_callback:
+            # The attenuated view is reused for the next chunk, so give the
+            # callback its own copy
+            if isinstance(processed_data, memoryview):
+                processed_data = bytes(processed_data)
+            self.input_callback(processed_data)
+
+    def _resize_gate_buffers(self, size: int) -> None:
+        """Allocate the echo gate's output and scratch buffers for ``size`` samples."""
+        self._out_bytes = bytearray(size * 2)
+        self._out_buf = np.frombuffer(self._out_bytes, dtype=np.int16)
+        self._scratch_i32 = np.empty(size, dtype=np.int32)
+
     def stop_recording(self) -> None:
         """Stop recording audio from the microphone."""
         self.is_recording = False
@@ -207,54 +317,142 @@ class CustomAudioInterface(AudioInterface):
         if not self.is_recording:
             self.start_recording()
 
-        try:
-            return self.audio_queue.get(block=True, timeout=0.1)
-        except queue.Empty:
-            return b'\x00' * chunk_size * self.channels * 2  # Return silence
+        data = self._ring_pop()
+        if data is None:
+            # Wait up to one chunk duration for the callback to push a chunk.
+            # Check again after clearing so a push in between is not missed.
+            self._data_ready.clear()
+            data = self._ring_pop()
+            if data is None and self._data_ready.wait(self.chunk_size / self.sample_rate):
+                data = self._ring_pop()
+
+        if data is None:
+            # Return silence, reusing the cached buffer when the size matches
+            if len(self._silence) != chunk_size * self.channels * self._sample_bytes:
+                self._silence = bytes(chunk_size * self.channels * self._sample_bytes)
+            return self._silence
+        return data
+
+    def _ring_push(self, data: bytes) -> None:
+        """Copy a chunk into the next ring slot, overwriting the oldest if full."""
+        slot = self._head & (RING_SLOTS - 1)
+        size = len(data)
+        buf = self._ring[slot]
+        if size > len(buf):
+            self._ring[slot] = buf = bytearray(size)
+        buf[:size] = data
+        self._ring_lens[slot] = size
+        self._head += 1
+        self._data_ready.set()
+
+    def _ring_pop(self) -> Optional[bytes]:
+        """Take the oldest chunk from the ring, or None if it is empty."""
+        head = self._head
+        # If the callback lapped us, skip to the oldest slot it is not writing
+        tail = max(self._tail, head - RING_SLOTS + 1)
+        if tail >= head:
+            return None
+        slot = tail & (RING_SLOTS - 1)
+        data = bytes(memoryview(self._ring[slot])[:self._ring_lens[slot]])
+        self._tail = tail + 1
+        return data
+
+    def _open_output_stream(self):
+        """Open the output stream used by play_audio."""
+        def callback(in_data, frame_count, time_info, status):  # pylint: disable=unused-argument
+            _elevate_audio_priority()
+            return (self._read_output(frame_count * self.channels * self._sample_bytes), pyaudio.paContinue)
+
+        # Create a callback output stream that drains the output ring
+        return self.p.open(
+            format=self.format_type,
+            channels=self.channels,
+            rate=self.sample_rate,
+            output=True,
+            output_device_index=self.output_device_index,
+            frames_per_buffer=self.chunk_size,
+            stream_callback=callback
+        )
+
+    def _output_is_active(self) -> bool:
+        """Check whether the output stream is running."""
+        return self.output_stream.is_active()
+
+    def _stop_output_stream(self) -> None:
+        """Stop the output stream."""
+        self.output_stream.stop_stream()
 
     def play_audio(self, audio_data: bytes) -> None:
         """Play audio data through the speakers with echo suppression."""
         # Store the output audio for echo suppression
         try:
-            # Convert to numpy array for later processing
+            # Copy into the next row of the recent output ring, overwriting the oldest
             output_data = np.frombuffer(audio_data, dtype=np.int16)
-            # Store in recent output buffer (limit to last 5 chunks to save memory)
-            self.recent_output_audio.append(output_data)
-            if len(self.recent_output_audio) > 5:
-                self.recent_output_audio.pop(0)  # Remove oldest chunk
+            row = self._recent_output[self._recent_output_idx % RECENT_OUTPUT_CHUNKS]
+            size = min(len(output_data), len(row))
+            row[:size] = output_data[:size]
+            row[size:] = 0
+            self._recent_output_idx += 1
+            self._last_play_ts = time.monotonic()
         except Exception as e:
             logger.error(f"Error storing output audio for echo suppression: {e}")
 
         # Create output stream if needed
         if self.output_stream is None:
-            # Create a non-callback output stream for direct writing
-            self.output_stream = self.p.open(
-                format=self.format_type,
-                channels=self.channels,
-                rate=self.sample_rate,
-                output=True,
-                output_device_index=self.output_device_index,
-                frames_per_buffer=self.chunk_size
-                # No stream_callback for direct writing
-            )
-
-        # Play the audio
+            self.output_stream = self._open_output_stream()
+
+        # Queue the audio for the output callback
         self.is_playing = True
         try:
-            self.output_stream.write(audio_data)
+            self._write_output(audio_data)
         except Exception as e:
             logger.error(f"Error playing audio: {e}")
-        finally:
-            self.is_playing = False
 
-        # Clear the output buffer after a short delay
-        # This helps prevent echo suppression from affecting subsequent user input
-        def clear_output_buffer():
-            time.sleep(0.5)  # Wait for echo to fade
-            self.recent_output_audio = []
+    def _write_output(self, audio_data: bytes) -> None:
+        """Copy audio into the output ring, waiting only while it is full."""
+        capacity = len(self._out_ring)
+        view = memoryview(audio_data).cast("B")
+        while view:
+            free = capacity - (self._out_tail - self._out_head)
+            if free == 0:
+                # Check again after clearing so space freed in between is not missed
+                self._out_space.clear()
+                if capacity - (self._out_tail - self._out_head) == 0:
+                    self._out_space.wait(0.1)
+                    if self.output_stream is None or not self._output_is_active():
+                        logger.warning("Output stream stopped, dropping queued audio")
+                        return
+                continue
+
+            pos = self._out_tail % capacity
+            size = min(len(view), free, capacity - pos)
+            self._out_ring[pos:pos + size] = view[:size]
+            self._out_tail += size
+            view = view[size:]
+
+    def _read_output(self, size: int) -> bytes:
+        """Take the next ``size`` bytes from the output ring, padded with silence."""
+        capacity = len(self._out_ring)
+        head = max(self._out_head, self._out_discard_to)
+        available = min(size, self._out_tail - head)
+
+        pos = head % capacity
+        first = min(available, capacity - pos)
+        data = bytes(self._out_ring[pos:pos + first])
+        if available > first:
+            data += bytes(self._out_ring[:available - first])
+        if available:
+            # Echo tail is measured from when audio actually reaches the device,
+            # not from when it was queued
+            self._last_play_ts = time.monotonic()
+        if available < size:
+            data += bytes(size - available)
+            if available == 0:
+                self.is_playing = False
 
-        # Start a thread to clear the buffer
-        threading.Thread(target=clear_output_buffer, daemon=True).start()
+        self._out_head = head + available
+        self._out_space.set()
+        return data
 
     def set_echo_suppression(self, enabled: bool, threshold: float = None, attenuation: float = None) -> None:
         """Enable or disable echo suppression.
@@ -267,8 +465,10 @@ class CustomAudioInterface(AudioInterface):
         self.echo_suppression_enabled = enabled
         if threshold is not None:
             self.noise_gate_threshold = max(0.0, min(1.0, threshold))
+            self._gate_ss_per_sample = (self.noise_gate_threshold * 32767.0) ** 2
         if attenuation is not None:
             self.echo_attenuation = max(0.0, min(1.0, attenuation))
+            self._gain_q15 = _gain_q15(self.echo_attenuation)
 
         logger.info(f"Echo suppression {'enabled' if enabled else 'disabled'} "
                    f"(threshold={self.noise_gate_threshold}, attenuation={self.echo_attenuation})")
@@ -279,8 +479,8 @@ class CustomAudioInterface(AudioInterface):
 
         if self.output_stream:
             try:
-                if self.output_stream.is_active():
-                    self.output_stream.stop_stream()
+                if self._output_is_active():
+                    self._stop_output_stream()
                 self.output_stream.close()
             except Exception as e:
                 logger.error(f"Error cleaning up output stream: {e}")
@@ -300,9 +500,13 @@ class CustomAudioInterface(AudioInterface):
     @staticmethod
     def list_audio_devices() -> List[Dict[str, Any]]:
         """List available audio devices."""
-        p = pyaudio.PyAudio()
+        p = _get_pyaudio()
         devices = []
 
+        # Look up the defaults once rather than per device
+        default_input = p.get_default_input_device_info()['index']
+        default_output = p.get_default_output_device_info()['index']
+
         for i in range(p.get_device_count()):
             device_info = p.get_device_info_by_index(i)
             devices.append({
@@ -311,9 +515,83 @@ class CustomAudioInterface(AudioInterface):
                 'input_channels': device_info['maxInputChannels'],
                 'output_channels': device_info['maxOutputChannels'],
                 'default_sample_rate': device_info['defaultSampleRate'],
-                'is_default_input': p.get_default_input_device_info()['index'] == i,
-                'is_default_output': p.get_default_output_device_info()['index'] == i
+                'is_default_input': default_input == i,
+                'is_default_output': default_output == i
             })
 
-        p.terminate()
         return devices
+
+class SoundDeviceAudioInterface(CustomAudioInterface):
+    """
+    Low-latency variant of CustomAudioInterface using sounddevice streams.
+
+    Instead of fixed ``chunk_size`` buffers, PortAudio picks the native block
+    size (``blocksize=0``) and the device's low-latency settings, which cuts
+    round-trip latency on most host APIs. Requires the optional
+    ``sounddevice`` package; CustomAudioInterface remains the PyAudio fallback.
+    """
+
+    def start_recording(self) -> None:
+        """Start recording audio from the microphone."""
+        if self.is_recording:
+            return
+
+        import sounddevice as sd
+
+        def callback(indata, frames, time_info, status):  # pylint: disable=unused-argument
+            _elevate_audio_priority()
+            if self.is_recording:
+                # indata is only valid during the callback, so copy it out
+                self._process_input(bytes(indata))
+
+        self.input_stream = sd.RawInputStream(
+            samplerate=self.sample_rate,
+            blocksize=0,
+            device=self.input_device_index,
+            channels=self.channels,
+            dtype="int16",
+            latency="low",
+            callback=callback
+        )
+        self.input_stream.start()
+
+        self.is_recording = True
+        logger.debug(f"Started recording (input latency {self.input_stream.latency * 1000:.1f} ms)")
+
+    def stop_recording(self) -> None:
+        """Stop recording audio from the microphone."""
+        self.is_recording = False
+        if self.input_stream:
+            self.input_stream.stop()
+            self.input_stream.close()
+            self.input_stream = None
+        logger.debug("Stopped recording")
+
+    def _open_output_stream(self):
+        """Open a low-latency output stream that drains the output ring."""
+        import sounddevice as sd
+
+        def callback(outdata, frames, time_info, status):  # pylint: disable=unused-argument
+            _elevate_audio_priority()
+            outdata[:] = self._read_output(len(outdata))
+
+        stream = sd.RawOutputStream(
+            samplerate=self.sample_rate,
+            blocksize=0,
+            device=self.output_device_index,
+            channels=self.channels,
+            dtype="int16",
+            latency="low",
+            callback=callback
+        )
+        stream.start()
+        logger.debug(f"Opened output stream (output latency {stream.latency * 1000:.1f} ms)")
+        return stream
+
+    def _output_is_active(self) -> bool:
+        """Check whether the output stream is running."""
+        return self.output_stream.active
+
+    def _stop_output_stream(self) -> None:
+        """Stop the output stream."""
+        self.output_stream.stop()
@@ -10,118 +10,190 @@
 # @raycast.icon 🎁
 # @raycast.argument1 { "type": "text", "placeholder": "Total credits" }
 
+# Set GAVIN_DEBUG=1 to monitor the page state for 30 seconds before the
+# text-based button search.
+
 import asyncio
+import collections
+import os
+import re
 import sys
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import subprocess
 import time
-from datetime import datetime
+import weakref
+from datetime import datetime, timedelta
+
+# Collects the button and special element state of a frame in a single
+# in-page pass; visibility mirrors Playwright's is_visible()
+FRAME_STATE_JS = """() => {
+    const visible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+    const buttons = [...document.querySelectorAll('button')].map((b) => ({text: b.textContent, visible: visible(b)}));
+    const special = [...document.querySelectorAll("#content-subscription, [data-testid='gift-credits-button']")].map((e) => ({visible: visible(e)}));
+    return {buttons, special};
+}"""
+
+# Clicks the first button whose text contains the argument, in-page
+CLICK_BUTTON_BY_TEXT_JS = """(text) => {
+    for (const b of document.querySelectorAll('button')) {
+        if ((b.textContent || '').includes(text)) {
+            b.click();
+            return b.textContent;
+        }
+    }
+    return null;
+}"""
+
+# Clicks the button at the given index, in-page; returns the button count
+CLICK_BUTTON_AT_JS = """(index) => {
+    const buttons = document.querySelectorAll('button');
+    if (buttons.length > index) buttons[index].click();
+    return buttons.length;
+}"""
+
+# Number of network events kept in memory while monitoring
+NETWORK_HISTORY = 200
+
+# Take a monitoring screenshot every this many ticks
+SCREENSHOT_EVERY = 10
 
 def show_error(message):
     print(f"Error: {message}", file=sys.stderr)
     subprocess.run(['open', f'raycast://notification?title=Error&message={message}'])
     sys.exit(1)
 
+async def open_urls(*urls):
+    """Open URLs with a single `open` call without blocking the event loop"""
+    process = await asyncio.create_subprocess_exec('open', *urls)
+    await process.wait()
+
 async def monitor_page_state(page, duration=30):
     """Monitor page state changes over time"""
     print("\n=== Starting Page Monitoring ===")
     print(f"Monitoring for {duration} seconds...")
     
-    # Track network requests
-    requests = []
-    responses = []
+    # Track recent network requests as plain strings, bounded so long runs
+    # don't hold on to every event
+    requests = collections.deque(maxlen=NETWORK_HISTORY)
+    responses = collections.deque(maxlen=NETWORK_HISTORY)
+    totals = collections.Counter()
+    
+    # Events record a monotonic offset; wall-clock strings are only built when printed
+    start_wall = datetime.now()
+    start_mono = time.monotonic()
+    
+    def format_event_time(offset):
+        return (start_wall + timedelta(seconds=offset)).strftime('%H:%M:%S.%f')
     
     def handle_request(request):
+        totals['requests'] += 1
         requests.append({
-            'time': datetime.now().strftime('%H:%M:%S.%f'),
+            'time': time.monotonic() - start_mono,
             'url': request.url,
             'method': request.method,
             'resource_type': request.resource_type
         })
     
     def handle_response(response):
+        totals['responses'] += 1
         responses.append({
-            'time': datetime.now().strftime('%H:%M:%S.%f'),
+            'time': time.monotonic() - start_mono,
             'url': response.url,
             'status': response.status,
             'status_text': response.status_text
         })
     
+    # Last printed state of each frame, forgotten when the frame navigates
+    frame_cache = weakref.WeakKeyDictionary()
+    
+    def handle_frame_navigated(frame):
+        frame_cache.pop(frame, None)
+    
     # Set up event listeners
     page.on('request', handle_request)
     page.on('response', handle_response)
+    page.on('framenavigated', handle_frame_navigated)
     
-    start_time = time.time()
-    last_check = start_time
-    
-    while time.time() - start_time < duration:
-        current_time = time.time()
-        if current_time - last_check >= 1:  # Check every second
-            print(f"\n=== State at {datetime.now().strftime('%H:%M:%S')} ===")
-            
-            # Check DOM state
-            try:
-                # Get all frames
-                frames = page.frames
-                print(f"\nFrames found: {len(frames)}")
-                for i, frame in enumerate(frames):
-                    print(f"\nFrame {i}:")
-                    print(f"URL: {frame.url}")
-                    
-                    # Check for buttons
-                    buttons = await frame.query_selector_all("button")
-                    print(f"Buttons found: {len(buttons)}")
-                    for j, button in enumerate(buttons):
-                        try:
-                            text = await button.text_content()
-                            visible = await button.is_visible()
-                            print(f"  Button {j}: text='{text}', visible={visible}")
-                        except:
-                            print(f"  Button {j}: [error reading button]")
-                    
-                    # Check for specific elements
-                    elements = await frame.query_selector_all("#content-subscription, [data-testid='gift-credits-button']")
-                    print(f"Special elements found: {len(elements)}")
-                    for j, elem in enumerate(elements):
-                        try:
-                            visible = await elem.is_visible()
-                            print(f"  Element {j}: visible={visible}")
-                        except:
-                            print(f"  Element {j}: [error reading element]")
-            
-            except Exception as e:
-                print(f"Error checking DOM state: {str(e)}")
-            
-            # Print recent network activity
-            if requests:
-                print("\nRecent requests:")
-                for req in requests[-5:]:
-                    print(f"  {req['time']} - {req['method']} {req['url']}")
-            
-            if responses:
-                print("\nRecent responses:")
-                for resp in responses[-5:]:
-                    print(f"  {resp['time']} - {resp['status']} {resp['url']}")
-            
-            # Take periodic screenshots
+    async def do_tick(tick):
+        print(f"\n=== State at {datetime.now().strftime('%H:%M:%S')} ===")
+        
+        # Check DOM state
+        try:
+            # Get all frames
+            frames = page.frames
+            print(f"\nFrames found: {len(frames)}")
+            for i, frame in enumerate(frames):
+                print(f"\nFrame {i}:")
+                print(f"URL: {frame.url}")
+        
+                # Read buttons and specific elements in one round trip
+                try:
+                    state = await frame.evaluate(FRAME_STATE_JS)
+                except Exception as e:
+                    print(f"  [error reading frame: {str(e)}]")
+                    continue
+        
+                # Only print frames whose state changed since the last tick
+                if frame_cache.get(frame) == (frame.url, state):
+                    print("Unchanged since last check")
+                    continue
+                frame_cache[frame] = (frame.url, state)
+        
+                print(f"Buttons found: {len(state['buttons'])}")
+                for j, button in enumerate(state['buttons']):
+                    print(f"  Button {j}: text='{button['text']}', visible={button['visible']}")
+        
+                print(f"Special elements found: {len(state['special'])}")
+                for j, elem in enumerate(state['special']):
+                    print(f"  Element {j}: visible={elem['visible']}")
+        
+        except Exception as e:
+            print(f"Error checking DOM state: {str(e)}")
+        
+        # Print recent network activity
+        if requests:
+            print("\nRecent requests:")
+            for req in list(requests)[-5:]:
+                print(f"  {format_event_time(req['time'])} - {req['method']} {req['url']}")
+        
+        if responses:
+            print("\nRecent responses:")
+            for resp in list(responses)[-5:]:
+                print(f"  {format_event_time(resp['time'])} - {resp['status']} {resp['url']}")
+        
+        # Take periodic screenshots; viewport-only JPEGs are far cheaper to encode
+        if tick % SCREENSHOT_EVERY == 0:
             try:
                 timestamp = datetime.now().strftime('%H%M%S')
-                await page.screenshot(path=f'/tmp/elevenlabs-monitor-{timestamp}.png')
-                print(f"\nScreenshot saved to /tmp/elevenlabs-monitor-{timestamp}.png")
+                await page.screenshot(path=f'/tmp/elevenlabs-monitor-{timestamp}.jpg', type="jpeg", quality=60, full_page=False)
+                print(f"\nScreenshot saved to /tmp/elevenlabs-monitor-{timestamp}.jpg")
             except Exception as e:
                 print(f"Error taking screenshot: {str(e)}")
-            
-            last_check = current_time
         
-        await asyncio.sleep(0.1)  # Small sleep to prevent CPU overload
+    # Sleep until each tick is due instead of polling the clock
+    loop = asyncio.get_running_loop()
+    end = loop.time() + duration
+    next_tick = loop.time() + 1
+    tick = 0
+    while next_tick < end:
+        await asyncio.sleep(max(0, next_tick - loop.time()))
+        tick_start = loop.time()
+        await do_tick(tick)
+        tick += 1
+        next_tick = tick_start + 1
+    await asyncio.sleep(max(0, end - loop.time()))
     
     # Clean up event listeners
     page.remove_listener('request', handle_request)
     page.remove_listener('response', handle_response)
+    page.remove_listener('framenavigated', handle_frame_navigated)
     
     print("\n=== Monitoring Complete ===")
-    print(f"Total requests: {len(requests)}")
-    print(f"Total responses: {len(responses)}")
+    print(f"Total requests: {totals['requests']} (last {len(requests)} retained)")
+    print(f"Total responses: {totals['responses']} (last {len(responses)} retained)")
 
 async def wait_for_dynamic_content(page, timeout=60000):
     """Wait for dynamic content to load"""
@@ -154,46 +226,31 @@ async def find_and_click_by_text(page, text):
     """Find and click an element by its text content"""
     print(f"\nLooking for element with text: {text}")
     
-    # Monitor the page state first
-    await monitor_page_state(page)
+    # Monitoring takes 30 seconds, so only do it when debugging
+    if os.environ.get('GAVIN_DEBUG'):
+        await monitor_page_state(page)
     
-    # Try the simplest approach first
+    # Try the simplest approach first; the locator waits and retries in the browser
     try:
-        print("\nTrying direct text selector...")
-        # Get all elements with the text
-        elements = page.get_by_text(text, exact=False)
-        count = await elements.count()
-        print(f"Found {count} elements with text '{text}'")
-        
-        if count > 0:
-            # Try to click each element until one works
-            for i in range(count):
-                try:
-                    element = elements.nth(i)
-                    print(f"Attempting to click element {i+1}/{count}")
-                    await element.click()
-                    print("Click successful!")
-                    return True
-                except Exception as e:
-                    print(f"Click failed on element {i+1}: {str(e)}")
-                    continue
+        print("\nTrying button role locator...")
+        button = page.get_by_role("button", name=re.compile(re.escape(text), re.I)).first
+        await button.click(timeout=5000)
+        print("Click successful!")
+        return True
+    except PlaywrightTimeoutError:
+        print(f"No clickable button named '{text}' found")
     except Exception as e:
-        print(f"Text selector failed: {str(e)}")
+        print(f"Role locator failed: {str(e)}")
     
     # If that fails, try a more direct approach
     try:
         print("\nTrying direct button search...")
-        # Get all buttons and check their text
-        buttons = await page.query_selector_all("button")
-        print(f"Found {len(buttons)} buttons total")
-        
-        for i, button in enumerate(buttons):
-            button_text = await button.text_content()
-            if button_text and text in button_text:
-                print(f"Found matching button {i+1}: '{button_text}'")
-                await button.click()
-                print("Click successful!")
-                return True
+        # Find and click the matching button in a single round trip
+        button_text = await page.evaluate(CLICK_BUTTON_BY_TEXT_JS, text)
+        if button_text is not None:
+            print(f"Clicked matching button: '{button_text}'")
+            return True
+        print(f"No button with text '{text}' found")
     except Exception as e:
         print(f"Direct button search failed: {str(e)}")
     
@@ -204,18 +261,15 @@ async def click_gift_credits_directly(page):
     print("\nAttempting to click Gift Credits button directly...")
     
     try:
-        # Get all buttons in the main frame
-        buttons = await page.query_selector_all("button")
-        print(f"Found {len(buttons)} buttons total")
+        # Click button 22 (0-based index 21) in the main frame in a single round trip
+        count = await page.evaluate(CLICK_BUTTON_AT_JS, 21)
+        print(f"Found {count} buttons total")
         
-        # Try to click button 22 (0-based index 21)
-        if len(buttons) > 21:
-            print("Clicking button at index 21...")
-            await buttons[21].click()
-            print("Click successful!")
+        if count > 21:
+            print("Clicked button at index 21")
             return True
         else:
-            print(f"Not enough buttons found (need at least 22, found {len(buttons)})")
+            print(f"Not enough buttons found (need at least 22, found {count})")
             return False
     except Exception as e:
         print(f"Error clicking button directly: {str(e)}")
@@ -242,28 +296,38 @@ async def main():
             if not contexts:
                 show_error("No browser contexts found")
             
-            # Find Zendesk tab and get email
+            # Find Zendesk tabs and get email
             print("Searching for Zendesk tab...")
             user_email = None
             
+            candidates = []
             for context in contexts:
-                pages = context.pages
-                for page in pages:
-                    url = page.url
-                    print(f"Checking tab: {url}")
-                    if 'zendesk.com' in url:
-                        print("Found Zendesk tab, looking for email element...")
-                        try:
-                            email_element = await page.wait_for_selector('[data-test-id="email-value-test-id"]', timeout=10000)
-                            user_email = await email_element.text_content()
-                            user_email = user_email.strip()
-                            print(f"Found user email: {user_email}")
-                            break
-                        except Exception as e:
-                            print(f"Error finding email element: {str(e)}")
-                
-                if user_email:
-                    break
+                for page in context.pages:
+                    print(f"Checking tab: {page.url}")
+                    if 'zendesk.com' in page.url:
+                        candidates.append(page)
+            
+            if candidates:
+                # Wait on every Zendesk tab at once and take the first email found
+                print(f"Found {len(candidates)} Zendesk tab(s), looking for email element...")
+                pending = {
+                    asyncio.create_task(page.wait_for_selector('[data-test-id="email-value-test-id"]', timeout=10000))
+                    for page in candidates
+                }
+                try:
+                    while pending and not user_email:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            try:
+                                email_element = task.result()
+                                user_email = (await email_element.text_content()).strip()
+                                print(f"Found user email: {user_email}")
+                                break
+                            except Exception as e:
+                                print(f"Error finding email element: {str(e)}")
+                finally:
+                    for task in pending:
+                        task.cancel()
             
             if not user_email:
                 show_error("Please open a Zendesk ticket first")
@@ -310,8 +374,10 @@ async def main():
                 print("Dialog closed successfully")
                 
                 # Show success notification
-                subprocess.run(['open', 'raycast://confetti'])
-                subprocess.run(['open', f'raycast://notification?title=Success&message={credits} credits gifted successfully!'])
+                await open_urls(
+                    'raycast://confetti',
+                    f'raycast://notification?title=Success&message={credits} credits gifted successfully!'
+                )
                 
             except Exception as e:
                 print(f"Error during interaction: {str(e)}")
@@ -324,13 +390,15 @@ async def main():
             print("Script completed. Browser will remain open for verification.")
             print("Press Ctrl+C to close the browser when done.")
             
+            # Keep the script running until the browser goes away or the user interrupts
+            disconnected = asyncio.Event()
+            browser.on("disconnected", lambda _: disconnected.set())
             try:
-                # Keep the script running until user interrupts
-                while True:
-                    await asyncio.sleep(1)
-            except KeyboardInterrupt:
-                print("\nClosing browser...")
-                await browser.close()
+                await disconnected.wait()
+            finally:
+                if not disconnected.is_set():
+                    print("\nClosing browser...")
+                    await browser.close()
     
     except Exception as e:
         print(f"Uncaught error in main function: {str(e)}")
@@ -1,10 +1,18 @@
 from enum import Enum
 from datetime import datetime
-from typing import Dict, Optional, Any, Callable, List
-from dataclasses import dataclass, field, asdict
-import random
+from typing import Dict, Optional, Any, Callable, Iterator, List, Set, Tuple
+from dataclasses import dataclass, field
+import base64
+import functools
+import os
+import queue
+import re
 import string
-from collections import defaultdict
+from collections import defaultdict, deque
+import sys
+import threading
+import time
+from itertools import count, islice
 import rumps
 
 class JobStatus(str, Enum):
@@ -15,7 +23,93 @@ class JobStatus(str, Enum):
     CANCELLED = "cancelled"
     EXPIRED = "expired"
 
-@dataclass
+# Status lookup by value, cheaper than calling JobStatus(value)
+_STATUS_BY_VALUE = {status.value: status for status in JobStatus}
+
+# Status message templates, formatted with the job's tool name and error
+_STATUS_MESSAGES = {
+    JobStatus.PENDING: "Waiting to start {tool_name} job",
+    JobStatus.RUNNING: "Currently running {tool_name} job",
+    JobStatus.SUCCESS: "{tool_name} job completed successfully",
+    JobStatus.FAILED: "Job failed: {error}",
+    JobStatus.CANCELLED: "Job was cancelled",
+    JobStatus.EXPIRED: "Job has expired",
+}
+
+# Tool specific success messages, built from the job result
+_SUCCESS_MESSAGES = {
+    "fibonacci": lambda result: f"Fibonacci calculation completed. The result is {result['result']}",
+    "goose": lambda result: f"Goose command completed successfully for target {result['target']}",
+}
+
+# Placeholders in notification templates
+_TEMPLATE_RE = re.compile(r'\{([^{}]+)\}')
+
+_FORMATTER = string.Formatter()
+
+class _KeepMissing(dict):
+    """Format mapping that leaves unknown placeholders in place
+
+    Only safe for templates whose fields are plain names; see _is_simple_template.
+    """
+    def __missing__(self, key):
+        return f"{{{key}}}"
+
+@functools.lru_cache(maxsize=128)
+def _is_simple_template(template_str: str) -> bool:
+    """Whether every field is a bare name, with no indexing, attribute, conversion or format spec"""
+    try:
+        return all(
+            field_name is None or (field_name.isidentifier() and not spec and conversion is None)
+            for _, field_name, spec, conversion in _FORMATTER.parse(template_str)
+        )
+    except ValueError:
+        return False
+
+# Completion notifications waiting for the notification thread
+_notification_queue: "queue.Queue" = queue.Queue(maxsize=256)
+_notification_thread: Optional[threading.Thread] = None
+_notification_thread_lock = threading.Lock()
+
+def _notification_worker():
+    """Deliver queued notifications one at a time"""
+    while True:
+        title, subtitle, message = _notification_queue.get()
+        try:
+            rumps.notification(title, subtitle=subtitle, message=message)
+        except Exception as e:
+            print(f"Failed to send notification: {e}")
+
+def _queue_notification(title: str, subtitle: str, message: str):
+    """Queue a notification for the notification thread, starting it on first use"""
+    global _notification_thread
+    if _notification_thread is None:
+        with _notification_thread_lock:
+            if _notification_thread is None:
+                _notification_thread = threading.Thread(
+                    target=_notification_worker, name="job-notifications", daemon=True
+                )
+                _notification_thread.start()
+    try:
+        _notification_queue.put_nowait((title, subtitle, message))
+    except queue.Full:
+        # Drop rather than block the job update that triggered it
+        print(f"Notification queue full, dropping notification: {title}")
+
+# Statuses a job never leaves once reached
+_TERMINAL_STATUSES = frozenset({JobStatus.SUCCESS, JobStatus.FAILED, JobStatus.CANCELLED, JobStatus.EXPIRED})
+
+# Finished jobs kept around for status queries before being evicted
+MAX_FINISHED_JOBS = 1000
+FINISHED_JOB_TTL = 3600.0
+
+# Any job, finished or not, is dropped once it is this old
+JOB_MAX_AGE = 24 * 3600.0
+
+# Slotted dataclasses need Python 3.10+; older versions keep a __dict__ per job
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class Job:
     """Represents a background job in the system."""
     job_id: str
@@ -34,6 +128,12 @@ class Job:
     notify_on_completion: bool = False
     notification_title: Optional[str] = None
     notification_message: Optional[str] = None
+    # Monotonic timestamps for age checks; process-local, so not serialized
+    created_ts: float = field(default_factory=time.monotonic, repr=False, compare=False)
+    updated_ts: float = field(default_factory=time.monotonic, repr=False, compare=False)
+    _created_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # (updated_at, ISO string) pair, reformatted only when updated_at changes
+    _updated_iso: Optional[Tuple[datetime, str]] = field(default=None, init=False, repr=False, compare=False)
 
     def update(self, status: JobStatus, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
         """Update job status and related fields"""
@@ -41,6 +141,7 @@ class Job:
         self.result = result
         self.error = error
         self.updated_at = datetime.now()
+        self.updated_ts = time.monotonic()
 
         if self.on_status_change:
             self.on_status_change(self)
@@ -62,23 +163,23 @@ class Job:
             context.update(self.result)
 
         try:
-            return template_str.format(**context)
-        except KeyError:
-            # Fallback: replace only the keys that exist
-            import re
-            pattern = r'\{([^{}]+)\}'
-
+            # Simple templates leave unknown keys as-is; others must fully resolve
+            if _is_simple_template(template_str):
+                return template_str.format_map(_KeepMissing(context))
+            return template_str.format_map(context)
+        except (KeyError, AttributeError, IndexError, ValueError, TypeError):
+            # Fallback: replace only the plain keys that exist
             def replace_if_exists(match):
                 key = match.group(1)
                 return str(context[key]) if key in context else f"{{{key}}}"
 
-            return re.sub(pattern, replace_if_exists, template_str)
+            return _TEMPLATE_RE.sub(replace_if_exists, template_str)
         except Exception as e:
             print(f"Warning: Error formatting message: {e}")
             return template_str
 
     def _send_notification(self):
-        """Send a native notification for job completion"""
+        """Queue a native notification for job completion"""
         try:
             title = self.notification_title or f"{self.tool_name} job completed"
             message_template = self.notification_message or self.get_status_message()
@@ -86,54 +187,122 @@ class Job:
             # Format the message with the combined context
             message = self._format_with_context(message_template)
 
-            rumps.notification(title, subtitle="Gavin the Fish", message=message)
+            _queue_notification(title, "Gavin the Fish", message)
         except Exception as e:
             print(f"Failed to send notification: {e}")
 
     def get_status_message(self) -> str:
         """Generate a human-readable status message for the job."""
-        if self.status == JobStatus.PENDING:
-            return f"Waiting to start {self.tool_name} job"
-        elif self.status == JobStatus.RUNNING:
-            return f"Currently running {self.tool_name} job"
-        elif self.status == JobStatus.SUCCESS:
-            if self.tool_name == "fibonacci":
-                return f"Fibonacci calculation completed. The result is {self.result['result']}"
-            elif self.tool_name == "goose":
-                return f"Goose command completed successfully for target {self.result['target']}"
-            else:
-                return f"{self.tool_name} job completed successfully"
-        elif self.status == JobStatus.FAILED:
-            return f"Job failed: {self.error}"
-        elif self.status == JobStatus.CANCELLED:
-            return "Job was cancelled"
-        return f"Unknown status for {self.tool_name} job"
+        if self.status == JobStatus.SUCCESS and self.tool_name in _SUCCESS_MESSAGES:
+            return _SUCCESS_MESSAGES[self.tool_name](self.result)
+        template = _STATUS_MESSAGES.get(self.status)
+        if template is None:
+            return f"Unknown status for {self.tool_name} job"
+        return template.format(tool_name=self.tool_name, error=self.error)
+
+    def created_at_iso(self) -> str:
+        """ISO formatted creation time, formatted once and cached"""
+        if self._created_iso is None:
+            self._created_iso = self.created_at.isoformat()
+        return self._created_iso
+
+    def updated_at_iso(self) -> str:
+        """ISO formatted update time, cached until the job is next updated"""
+        cached = self._updated_iso
+        if cached is None or cached[0] is not self.updated_at:
+            cached = self._updated_iso = (self.updated_at, self.updated_at.isoformat())
+        return cached[1]
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert job to dictionary for Redis storage"""
-        data = asdict(self)
-        data['status'] = self.status.value
-        data['created_at'] = self.created_at.isoformat()
-        data['updated_at'] = self.updated_at.isoformat()
-        return data
+        """Convert job to dictionary for Redis storage
+
+        Nested values are shared rather than deep-copied, and the
+        on_status_change hook is left out since it can't be serialized.
+        """
+        return {
+            'job_id': self.job_id,
+            'tool_name': self.tool_name,
+            'input': self.input,
+            'status': self.status.value,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at_iso(),
+            'updated_at': self.updated_at_iso(),
+            'owner': self.owner,
+            'conversation_id': self.conversation_id,
+            'cancelable': self.cancelable,
+            'context': self.context,
+            'notify_on_completion': self.notify_on_completion,
+            'notification_title': self.notification_title,
+            'notification_message': self.notification_message,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Job':
         """Create job from dictionary from Redis storage"""
-        data['status'] = JobStatus(data['status'])
+        # Unknown values fall through to JobStatus() so they still raise ValueError
+        data['status'] = _STATUS_BY_VALUE.get(data['status']) or JobStatus(data['status'])
         data['created_at'] = datetime.fromisoformat(data['created_at'])
         data['updated_at'] = datetime.fromisoformat(data['updated_at'])
         return cls(**data)
 
 class JobRegistry:
-    """Registry to manage background jobs"""
-    def __init__(self):
+    """Registry to manage background jobs
+
+    Finished jobs are evicted once there are more than max_finished_jobs of
+    them or they finished more than finished_job_ttl seconds ago.
+    """
+    def __init__(self, max_finished_jobs: int = MAX_FINISHED_JOBS, finished_job_ttl: float = FINISHED_JOB_TTL):
         self._jobs: Dict[str, Job] = {}
+        self._max_finished_jobs = max_finished_jobs
+        self._finished_job_ttl = finished_job_ttl
+        # (updated_ts, job_id) for each job as it finishes, oldest first; deleted
+        # and re-finished jobs leave dead entries, so the cap uses _finished_count
+        self._finished_order: deque = deque()
+        self._finished_count = 0
         self._status_change_callbacks: Dict[str, List[Callable[[Job], None]]] = {}
+        # Cached get_all_jobs_with_status result, reset to None on every write
+        self._snapshot: Optional[List[Dict[str, Any]]] = None
+        # Creation order of each job, so filtered listings keep the same order
+        self._creation_order: Dict[str, int] = {}
+        self._creation_counter = count()
+        # (created_ts, job_id) in creation order, so expiry only looks at the oldest jobs
+        self._created_order: deque = deque()
+        # Secondary indexes from field value to job IDs, used by list_jobs filters
+        self._by_owner: Dict[str, Set[str]] = defaultdict(set)
+        self._by_status: Dict[JobStatus, Set[str]] = defaultdict(set)
+        self._by_tool: Dict[str, Set[str]] = defaultdict(set)
+        self._by_conversation: Dict[str, Set[str]] = defaultdict(set)
+
+    def _indexes_for(self, job: Job):
+        """Yield each secondary index along with the job's key in it"""
+        yield self._by_status, job.status
+        yield self._by_tool, job.tool_name
+        if job.owner is not None:
+            yield self._by_owner, job.owner
+        if job.conversation_id is not None:
+            yield self._by_conversation, job.conversation_id
+
+    def _index_job(self, job: Job):
+        """Add a job to the secondary indexes"""
+        for index, key in self._indexes_for(job):
+            index[key].add(job.job_id)
+
+    def _unindex_job(self, job: Job):
+        """Remove a job from the secondary indexes, dropping empty entries"""
+        for index, key in self._indexes_for(job):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(job.job_id)
+                if not ids:
+                    del index[key]
 
     def _generate_job_id(self) -> str:
-        """Generate a unique job ID using 5 random lowercase alphanumeric characters"""
-        return ''.join(random.choices(string.ascii_lowercase + string.digits, k=5))
+        """Generate a unique job ID using 5 random lowercase base32 characters"""
+        while True:
+            job_id = base64.b32encode(os.urandom(5)).decode('ascii')[:5].lower()
+            if job_id not in self._jobs:
+                return job_id
 
     def create_job(
         self,
@@ -162,6 +331,11 @@ class JobRegistry:
             notification_message=notification_message
         )
         self._jobs[job_id] = job
+        self._creation_order[job_id] = next(self._creation_counter)
+        self._created_order.append((job.created_ts, job_id))
+        self._compact_created_order()
+        self._index_job(job)
+        self._snapshot = None
         print(f"Created job {job_id} for tool {tool_name}")
         return job
 
@@ -173,7 +347,65 @@ class JobRegistry:
         """Update job status and related fields"""
         job = self.get_job(job_id)
         if job:
+            was_finished = job.status in _TERMINAL_STATUSES
+            # Move the job between status index entries
+            self._unindex_job(job)
             job.update(status, result, error)
+            self._index_job(job)
+            self._snapshot = None
+            is_finished = status in _TERMINAL_STATUSES
+            self._finished_count += is_finished - was_finished
+            if is_finished:
+                # Any earlier entry for this job is now superseded
+                self._finished_order.append((job.updated_ts, job_id))
+                self.evict_now()
+
+    def delete_job(self, job_id: str) -> bool:
+        """Delete a job"""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False
+        del self._creation_order[job_id]
+        self._unindex_job(job)
+        if job.status in _TERMINAL_STATUSES:
+            self._finished_count -= 1
+        self._snapshot = None
+        self._trim_created_order()
+        return True
+
+    def _created_entry_is_live(self, entry) -> bool:
+        """Whether a _created_order entry still refers to a job in the registry"""
+        created_ts, job_id = entry
+        job = self._jobs.get(job_id)
+        # A reused job ID belongs to a newer job with a different creation time
+        return job is not None and job.created_ts == created_ts
+
+    def _trim_created_order(self):
+        """Drop entries for deleted jobs from the front of _created_order"""
+        created = self._created_order
+        while created and not self._created_entry_is_live(created[0]):
+            created.popleft()
+
+    def _compact_created_order(self):
+        """Drop all dead entries once they make up most of _created_order"""
+        created = self._created_order
+        if len(created) > 2 * len(self._jobs) + 16:
+            live = [entry for entry in created if self._created_entry_is_live(entry)]
+            created.clear()
+            created.extend(live)
+
+    def clear(self) -> int:
+        """Delete all jobs, returning how many were removed"""
+        count = len(self._jobs)
+        self._jobs.clear()
+        self._creation_order.clear()
+        self._created_order.clear()
+        self._finished_order.clear()
+        self._finished_count = 0
+        self._snapshot = None
+        for index in (self._by_owner, self._by_status, self._by_tool, self._by_conversation):
+            index.clear()
+        return count
 
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a job"""
@@ -183,19 +415,94 @@ class JobRegistry:
             return True
         return False
 
-    def list_jobs(self) -> List[Job]:
-        """List all jobs"""
-        return list(self._jobs.values())
+    def evict_now(self) -> int:
+        """Evict finished jobs over the size cap or past their TTL, returning how many were removed"""
+        finished = self._finished_order
+        cutoff = time.monotonic() - self._finished_job_ttl
+        removed = 0
+        while finished and (self._finished_count > self._max_finished_jobs or finished[0][0] < cutoff):
+            finished_ts, job_id = finished.popleft()
+            if self._finished_entry_is_live(finished_ts, job_id) and self.delete_job(job_id):
+                removed += 1
+        # Dead entries behind live ones are only reached by the TTL, so compact when they pile up
+        if len(finished) > 2 * self._finished_count + 16:
+            live = [entry for entry in finished if self._finished_entry_is_live(*entry)]
+            finished.clear()
+            finished.extend(live)
+        return removed
+
+    def _finished_entry_is_live(self, finished_ts: float, job_id: str) -> bool:
+        """Whether a _finished_order entry is the latest finish of a job still in the registry"""
+        job = self._jobs.get(job_id)
+        # Skip entries for jobs deleted since, or superseded by a later update
+        return job is not None and job.status in _TERMINAL_STATUSES and job.updated_ts == finished_ts
+
+    def cleanup_expired_jobs(self, max_age_seconds: float) -> int:
+        """Delete jobs created more than max_age_seconds ago, returning how many were removed"""
+        cutoff = time.monotonic() - max_age_seconds
+        removed = 0
+        while self._created_order and self._created_order[0][0] < cutoff:
+            entry = self._created_order.popleft()
+            # Jobs deleted earlier leave stale entries behind
+            if self._created_entry_is_live(entry) and self.delete_job(entry[1]):
+                removed += 1
+        return removed
+
+    def list_jobs(
+        self,
+        owner: Optional[str] = None,
+        status: Optional[JobStatus] = None,
+        tool_name: Optional[str] = None,
+        conversation_id: Optional[str] = None
+    ) -> List[Job]:
+        """List jobs, optionally filtered by owner, status, tool or conversation"""
+        filters = [
+            index.get(key, set())
+            for index, key in (
+                (self._by_owner, owner),
+                (self._by_status, status),
+                (self._by_tool, tool_name),
+                (self._by_conversation, conversation_id),
+            )
+            if key is not None
+        ]
+        if not filters:
+            return list(self._jobs.values())
+
+        # Intersect starting from the smallest set of matching IDs
+        smallest, *rest = sorted(filters, key=len)
+        job_ids = smallest.intersection(*rest)
+        return [self._jobs[job_id] for job_id in sorted(job_ids, key=self._creation_order.__getitem__)]
+
+    def iter_jobs(self, status: Optional[JobStatus] = None, limit: int = 50, offset: int = 0) -> Iterator[Job]:
+        """Iterate over one page of jobs in creation order, optionally filtered by status
+
+        The iterator is lazy, so consume it before creating or deleting jobs.
+        """
+        if status is None:
+            return islice(self._jobs.values(), offset, offset + limit)
+        job_ids = sorted(self._by_status.get(status, ()), key=self._creation_order.__getitem__)
+        return (self._jobs[job_id] for job_id in islice(job_ids, offset, offset + limit))
+
+    def list_jobs_by_status(self, status: JobStatus) -> List[Job]:
+        """List jobs with the given status, in creation order"""
+        return self.list_jobs(status=status)
 
     def get_all_jobs_with_status(self) -> List[Dict[str, Any]]:
-        """Get all jobs with their status information"""
-        return [{
-            "job_id": job.job_id,
-            "tool_name": job.tool_name,
-            "status": job.status.value,
-            "status_message": job.get_status_message(),
-            "created_at": job.created_at.isoformat(),
-            "updated_at": job.updated_at.isoformat()
-        } for job in self._jobs.values()]
+        """Get all jobs with their status information
+
+        The list is cached until the next write through the registry, so
+        callers must not modify it.
+        """
+        if self._snapshot is None:
+            self._snapshot = [{
+                "job_id": job.job_id,
+                "tool_name": job.tool_name,
+                "status": job.status.value,
+                "status_message": job.get_status_message(),
+                "created_at": job.created_at_iso(),
+                "updated_at": job.updated_at_iso()
+            } for job in self._jobs.values()]
+        return self._snapshot
 
 job_registry = JobRegistry()
\ No newline at end of file
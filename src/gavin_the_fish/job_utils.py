@@ -7,6 +7,9 @@ import inspect
 
 T = TypeVar('T', bound=BaseModel)
 
+# Request fields used for the job itself rather than passed to the job function
+_JOB_FIELDS = frozenset(('owner', 'conversation_id'))
+
 class JobRequest(BaseModel):
     """Base class for job requests"""
     owner: Optional[str] = None
@@ -64,10 +67,13 @@ def job_router(
             background_tasks: BackgroundTasks
         ) -> JobResponse:
             try:
+                # Serialize the request once for both the job input and the job function
+                payload = request.model_dump()
+                
                 # Create a new job
                 job = job_registry.create_job(
                     tool_name=tool_name,
-                    input=request.dict(),
+                    input=payload,
                     owner=getattr(request, 'owner', None),
                     conversation_id=getattr(request, 'conversation_id', None),
                     cancelable=cancelable
@@ -77,7 +83,7 @@ def job_router(
                 background_tasks.add_task(
                     job_function,
                     job.job_id,
-                    **{k: v for k, v in request.dict().items() if k not in ['owner', 'conversation_id']}
+                    **{k: v for k, v in payload.items() if k not in _JOB_FIELDS}
                 )
                 
                 return JobResponse(
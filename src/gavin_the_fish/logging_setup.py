@@ -0,0 +1,27 @@
+"""
+Shared console and logging setup for the Gavin the Fish scripts.
+
+This module provides a single lazily created Rich console and the Rich
+logging configuration used by the conversation entry points.
+"""
+
+import functools
+import logging
+
+from rich.console import Console
+from rich.logging import RichHandler
+
+@functools.lru_cache(maxsize=1)
+def get_console() -> Console:
+    """Get the shared Rich console, creating it on first use."""
+    return Console()
+
+def setup_logging(debug: bool = False) -> None:
+    """Set up logging with rich handler."""
+    level = logging.DEBUG if debug else logging.INFO
+    logging.basicConfig(
+        level=level,
+        format="%(message)s",
+        datefmt="[%X]",
+        handlers=[RichHandler(rich_tracebacks=True, console=get_console())]
+    )
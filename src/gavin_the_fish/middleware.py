@@ -1,45 +1,67 @@
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 from .config import settings
+from .logging_setup import get_console
+import hmac
 import json
 from datetime import datetime
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+from rich.markup import escape
 import logging
 import os
 from pathlib import Path
 
-# Initialize Rich console
-console = Console()
+# Shared Rich console
+console = get_console()
+
+# The Rich request summary is only worth rendering for a person watching a terminal
+_PRINT_REQUESTS = settings.LOG_VERBOSE and console.is_terminal
+
+SENSITIVE_HEADERS = frozenset({'authorization', 'cookie', 'set-cookie', 'x-api-key'})
+# Starlette keeps raw header names as lowercase bytes
+_SENSITIVE_RAW_HEADERS = frozenset(h.encode('latin-1') for h in SENSITIVE_HEADERS)
+
+# Encoded once for the constant time comparison in verify_api_key
+_EXPECTED_API_KEY = settings.API_KEY.encode()
 
 # Set up logging
 def setup_logging():
+    logger = logging.getLogger(__name__)
+    file_logger = logging.getLogger(f"{__name__}.requests")
+    # Already set up, e.g. the module was reloaded; don't attach another FileHandler
+    if file_logger.handlers:
+        return logger, file_logger
+
     # Create logs directory if it doesn't exist
     log_path = Path(settings.LOG_FILE)
     log_path.parent.mkdir(parents=True, exist_ok=True)
     
     # Configure logging
+    file_handler = logging.FileHandler(settings.LOG_FILE)
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S',
         handlers=[
-            logging.FileHandler(settings.LOG_FILE),
+            file_handler,
             logging.StreamHandler()  # Also log to console
         ]
     )
-    return logging.getLogger(__name__)
 
-# Get logger instance
-logger = setup_logging()
+    # Logger that writes request details to the log file only
+    file_logger.propagate = False
+    file_logger.setLevel(logging.INFO)
+    file_logger.addHandler(file_handler)
+
+    return logger, file_logger
+
+# Get logger instances
+logger, file_logger = setup_logging()
 
-def sanitize_headers(headers: dict) -> dict:
-    """Sanitize headers by removing sensitive information"""
-    sensitive_headers = ['authorization', 'cookie', 'set-cookie', 'x-api-key']
+def sanitize_raw_headers(raw_headers) -> dict:
+    """Sanitize raw (name, value) byte pairs, as found in request.headers.raw"""
     return {
-        k: v for k, v in headers.items()
-        if k.lower() not in sensitive_headers
+        k.decode('latin-1'): v.decode('latin-1') for k, v in raw_headers
+        if k not in _SENSITIVE_RAW_HEADERS
     }
 
 def format_log_entry(metadata: dict, stdout: bool = True) -> str:
@@ -59,21 +81,23 @@ Request Details:
     if stdout:
         logger.info(log_str)
     else:
-        # Get the file handler and log directly to it
-        for handler in logger.handlers:
-            if isinstance(handler, logging.FileHandler):
-                handler.emit(logging.LogRecord(
-                    name=logger.name,
-                    level=logging.INFO,
-                    pathname=__file__,
-                    lineno=0,
-                    msg=log_str,
-                    args=(),
-                    exc_info=None
-                ))
+        file_logger.info(log_str)
     
     return log_str
 
+def print_request_summary(metadata: dict):
+    """Print request metadata to the console as a single block of Rich markup"""
+    client = metadata['client']
+    headers_str = "\n".join(
+        f"  [cyan]{escape(k)}[/cyan]: [green]{escape(v)}[/green]"
+        for k, v in metadata['headers'].items()
+    )
+    console.print(
+        f"\n[bold blue]Request[/bold blue] [bold]{metadata['method']}[/bold] "
+        f"[blue]{escape(metadata['url'])}[/blue] from {client['host']}:{client['port']} "
+        f"at {metadata['timestamp']}\n[bold]Headers:[/bold]\n{headers_str}\n"
+    )
+
 async def log_request_metadata(request: Request, call_next):
     """Middleware to log request metadata including headers"""
     try:
@@ -82,38 +106,15 @@ async def log_request_metadata(request: Request, call_next):
             "timestamp": datetime.now().isoformat(),
             "method": request.method,
             "url": str(request.url),
-            "headers": sanitize_headers(dict(request.headers)),
+            "headers": sanitize_raw_headers(request.headers.raw),
             "client": {
                 "host": request.client.host if request.client else None,
                 "port": request.client.port if request.client else None
             }
         }
         
-        # Create a table for the request info
-        request_table = Table.grid(padding=(0, 1))
-        request_table.add_row("Time:", metadata['timestamp'])
-        request_table.add_row("Method:", f"[bold]{metadata['method']}[/bold]")
-        request_table.add_row("URL:", f"[blue]{metadata['url']}[/blue]")
-        request_table.add_row("Client:", f"{metadata['client']['host']}:{metadata['client']['port']}")
-        
-        # Create a table for headers
-        headers_table = Table(show_header=True, header_style="bold magenta")
-        headers_table.add_column("Header", style="cyan")
-        headers_table.add_column("Value", style="green")
-        
-        for header, value in metadata['headers'].items():
-            headers_table.add_row(header, value)
-        
-        # Print the formatted output to console
-        console.print("\n")
-        console.print(Panel.fit(
-            request_table,
-            title="[bold blue]Request Details[/bold blue]",
-            border_style="blue"
-        ))
-        console.print("\n[bold]Headers:[/bold]")
-        console.print(headers_table)
-        console.print("\n")
+        if _PRINT_REQUESTS:
+            print_request_summary(metadata)
         
         # Log detailed request info to file only
         format_log_entry(metadata, stdout=False)
@@ -127,35 +128,29 @@ async def log_request_metadata(request: Request, call_next):
 
 async def verify_api_key(request: Request, call_next):
     """Middleware to verify API key"""
-    try:
-        # Get API key from header
-        api_key = request.headers.get("X-API-Key")
-        
-        if not api_key:
-            print("API key is missing")
-            return JSONResponse(
-                status_code=401,
-                content={
-                    "status_code": 401,
-                    "detail": "API key is missing"
-                }
-            )
-        
-        # Verify API key
-        if api_key != settings.API_KEY:
-            print("Invalid API key")
-            return JSONResponse(
-                status_code=401,
-                content={
-                    "status_code": 401,
-                    "detail": "Invalid API key"
-                }
-            )
-        
-        # API key is valid, proceed with request
-        print("API key verified")
-        return await call_next(request)
-        
-    except Exception as e:
-        print(f"Error in API key verification: {str(e)}")
-        raise 
\ No newline at end of file
+    # Get API key from header
+    api_key = request.headers.get("X-API-Key")
+    
+    if not api_key:
+        logger.debug("API key is missing")
+        return JSONResponse(
+            status_code=401,
+            content={
+                "status_code": 401,
+                "detail": "API key is missing"
+            }
+        )
+    
+    # Verify API key in constant time
+    if not hmac.compare_digest(api_key.encode(), _EXPECTED_API_KEY):
+        logger.debug("Invalid API key")
+        return JSONResponse(
+            status_code=401,
+            content={
+                "status_code": 401,
+                "detail": "Invalid API key"
+            }
+        )
+    
+    # API key is valid, proceed with request
+    return await call_next(request)
@@ -1,29 +1,106 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError, HTTPException
+import asyncio
+import httpx
 import importlib
+import json
+import logging
+import logging.handlers
+import queue
 import os
 import pkgutil
-from .middleware import verify_api_key, log_request_metadata
+import uvicorn
+from .middleware import verify_api_key, log_request_metadata, file_logger
 from .exceptions import ResourceNotFoundError, BadRequestError
-from .agent import update_agent_tools
-from rich.traceback import install
-from rich.console import Console
+from .agent import update_agent_tools, close_http_client
+from . import install_rich_tracebacks
 from contextlib import asynccontextmanager
 from .tools import registry
+from .job_registry import job_registry, JOB_MAX_AGE
 
-# Initialize Rich console and install traceback handler
-console = Console()
-install(show_locals=False, width=console.width)
+# Install Rich traceback handler
+install_rich_tracebacks()
+
+logger = logging.getLogger(__name__)
+
+def _start_log_listener(target: logging.Logger) -> logging.handlers.QueueListener:
+    """Move a logger's handlers behind a queue so request handlers never block on log I/O."""
+    handlers = target.handlers[:]
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        target.removeHandler(handler)
+    target.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+def _stop_log_listener(target: logging.Logger, listener: logging.handlers.QueueListener):
+    """Flush queued log records and give the logger its handlers back."""
+    listener.stop()
+    for handler in target.handlers[:]:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            target.removeHandler(handler)
+    for handler in listener.handlers:
+        target.addHandler(handler)
+
+def _signal_ready():
+    """Notify a parent process waiting on READY_FD that startup is complete."""
+    ready_fd = os.environ.pop("READY_FD", None)
+    if ready_fd is None:
+        return
+    try:
+        os.write(int(ready_fd), b"1")
+        os.close(int(ready_fd))
+    except OSError as e:
+        logger.error("Failed to signal readiness: %s", e)
+
+class ReadySignalServer(uvicorn.Server):
+    """uvicorn server that signals READY_FD only once its sockets are bound."""
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets=sockets)
+        if self.started:
+            _signal_ready()
+
+# How often stale jobs are swept from the registry
+JOB_CLEANUP_INTERVAL = 300.0
+
+async def _cleanup_jobs_periodically():
+    """Drop jobs older than JOB_MAX_AGE every JOB_CLEANUP_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(JOB_CLEANUP_INTERVAL)
+        removed = job_registry.cleanup_expired_jobs(JOB_MAX_AGE)
+        if removed:
+            logger.info("Removed %d expired jobs", removed)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI app."""
     # Startup
-    await update_agent_tools()
+    # The request file logger doesn't propagate, so it needs its own listener
+    log_listeners = [(target, _start_log_listener(target))
+                     for target in (logging.getLogger(), file_logger)]
+    # Shared client for outbound requests made by tool endpoints
+    app.state.http = httpx.AsyncClient(timeout=10.0)
+    # Push the agent config in the background so requests are served straight away
+    app.state.tools_ready = asyncio.create_task(update_agent_tools())
+    job_cleanup = asyncio.create_task(_cleanup_jobs_periodically())
     yield
     # Shutdown
-    pass
+    job_cleanup.cancel()
+    try:
+        await job_cleanup
+    except asyncio.CancelledError:
+        pass
+    try:
+        await asyncio.wait_for(app.state.tools_ready, timeout=5)
+    except Exception as e:
+        logger.warning("Agent tools update did not complete: %r", e)
+    await close_http_client()
+    await app.state.http.aclose()
+    for target, listener in reversed(log_listeners):
+        _stop_log_listener(target, listener)
 
 app = FastAPI(
     title="Gavin the Fish API",
@@ -36,6 +113,15 @@ app = FastAPI(
 app.middleware("http")(log_request_metadata)  # Log request metadata first
 app.middleware("http")(verify_api_key)  # Then verify API key
 
+@app.get("/healthz")
+async def healthz():
+    """Report whether the agent tools update has finished"""
+    task = app.state.tools_ready
+    return {
+        "status": "ok",
+        "agent_tools_ready": task.done() and not task.cancelled() and task.exception() is None
+    }
+
 def create_error_response(status_code: int, detail: str) -> JSONResponse:
     return JSONResponse(
         status_code=status_code,
@@ -45,54 +131,78 @@ def create_error_response(status_code: int, detail: str) -> JSONResponse:
         }
     )
 
+# Pre-encoded bodies for the errors whose detail never changes
+_FIXED_ERRORS = {
+    code: json.dumps({"status_code": code, "detail": detail}, separators=(",", ":")).encode()
+    for code, detail in [
+        (404, "Not Found"),
+        (405, "Method Not Allowed"),
+        (422, "Validation Error"),
+        (500, "Internal Server Error"),
+    ]
+}
+
+def fixed_error_response(status_code: int) -> Response:
+    return Response(content=_FIXED_ERRORS[status_code], status_code=status_code, media_type="application/json")
+
 # Global exception handlers
 @app.exception_handler(ResourceNotFoundError)
 async def resource_not_found_handler(request: Request, exc: ResourceNotFoundError):
-    print(f"Resource not found: {exc.detail}")
+    logger.info("Resource not found: %s", exc.detail)
     return create_error_response(exc.status_code, exc.detail)
 
 @app.exception_handler(BadRequestError)
 async def bad_request_handler(request: Request, exc: BadRequestError):
-    print(f"Bad request: {exc.detail}")
+    logger.info("Bad request: %s", exc.detail)
     return create_error_response(exc.status_code, exc.detail)
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    print(f"HTTP exception: {exc.detail}")
+    logger.info("HTTP exception: %s", exc.detail)
     return create_error_response(exc.status_code, exc.detail)
 
 @app.exception_handler(404)
 async def not_found_handler(request: Request, exc: Exception):
-    print("Not found")
-    return create_error_response(404, "Not Found")
+    logger.info("Not found")
+    return fixed_error_response(404)
 
 @app.exception_handler(405)
 async def method_not_allowed_handler(request: Request, exc: Exception):
-    return create_error_response(405, "Method Not Allowed")
+    return fixed_error_response(405)
 
 @app.exception_handler(500)
 async def internal_server_error_handler(request: Request, exc: Exception):
-    print(f"Internal server error: {str(exc)}")
-    return create_error_response(500, "Internal Server Error")
+    logger.error("Internal server error: %s", exc, exc_info=exc)
+    return fixed_error_response(500)
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    print(f"Validation error: {str(exc)}")
-    return create_error_response(422, "Validation Error")
+    logger.info("Validation error: %s", exc)
+    return fixed_error_response(422)
+
+# Prefixes already included, so no router is registered twice
+_included_prefixes = set()
+
+def _include_router_once(router):
+    """Include a router unless one with the same prefix is already registered"""
+    if router.prefix in _included_prefixes:
+        logger.warning("Skipping duplicate router for %s", router.prefix)
+        return
+    _included_prefixes.add(router.prefix)
+    app.include_router(router)
 
 # Dynamically import and include all routers
 for module_info in pkgutil.iter_modules([os.path.join(os.path.dirname(__file__), "tools")]):
     if not module_info.name.startswith('__'):
         module = importlib.import_module(f".tools.{module_info.name}", package="gavin_the_fish")
         if hasattr(module, 'router'):
-            app.include_router(module.router)
+            _include_router_once(module.router)
 
 # Include routers from the tool registry
 for tool_name in registry.list_tools():
     router = registry.get_router(tool_name)
     if router:
-        app.include_router(router)
+        _include_router_once(router)
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    ReadySignalServer(uvicorn.Config(app, host="0.0.0.0", port=8000)).run()
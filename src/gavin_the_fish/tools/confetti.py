@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException
-import subprocess
+import asyncio
 from ..exceptions import BadRequestError
 
 router = APIRouter(
@@ -13,13 +13,14 @@ async def trigger_confetti():
     try:
         # Run the Raycast confetti command
         print("Triggering Raycast confetti")
-        result = subprocess.run(
-            ["open", "raycast://confetti"],
-            capture_output=True,
-            text=True
+        process = await asyncio.create_subprocess_exec(
+            "open", "raycast://confetti",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
-        if result.returncode != 0:
-            raise BadRequestError(f"Failed to trigger confetti: {result.stderr}")
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise BadRequestError(f"Failed to trigger confetti: {stderr.decode()}")
         return {
             "status_code": 200,
             "message": "Confetti triggered!"
@@ -8,7 +8,6 @@ that can be used by the ElevenLabs agent.
 from typing import Any, Callable, Dict, List, Optional, Type, TypeVar, Union
 from pydantic import BaseModel, Field
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
-import inspect
 import logging
 import asyncio
 from ..job_utils import JobResponse, job_context
@@ -72,7 +71,7 @@ class ToolRegistry:
         # Add the main endpoint - handle both with and without trailing slash
         @router.post("")
         @router.post("/")
-        async def execute_tool(request: Request, background_tasks: BackgroundTasks):
+        async def execute_tool(request: Request, background_tasks: BackgroundTasks) -> Dict[str, Any]:
             try:
                 # Get the request body
                 body = await request.json()
@@ -157,8 +156,8 @@ class ToolRegistry:
                                         error=current_job.error,
                                         parameters=body,
                                         is_job=True,
-                                        started_at=current_job.created_at.isoformat(),
-                                        completed_at=current_job.updated_at.isoformat(),
+                                        started_at=current_job.created_at_iso(),
+                                        completed_at=current_job.updated_at_iso(),
                                         status_message=current_job.get_status_message() if hasattr(current_job, 'get_status_message') else None
                                     )
 
@@ -173,7 +172,7 @@ class ToolRegistry:
                                         result={},
                                         parameters=body,
                                         is_job=True,
-                                        started_at=job.created_at.isoformat()
+                                        started_at=job.created_at_iso()
                                     )
 
                                 # Wait a bit before checking again
@@ -218,8 +217,8 @@ class ToolRegistry:
                     error=job.error,
                     parameters=job.input,
                     is_job=True,
-                    started_at=job.created_at.isoformat(),
-                    completed_at=job.updated_at.isoformat() if job.status in [JobStatus.SUCCESS, JobStatus.FAILED, JobStatus.CANCELLED] else None,
+                    started_at=job.created_at_iso(),
+                    completed_at=job.updated_at_iso() if job.status in [JobStatus.SUCCESS, JobStatus.FAILED, JobStatus.CANCELLED] else None,
                     status_message=job.get_status_message() if hasattr(job, 'get_status_message') else None
                 )
 
@@ -301,8 +300,8 @@ class ToolRegistry:
                     result=result,
                     parameters=kwargs,
                     is_job=True,
-                    started_at=job.created_at.isoformat(),
-                    completed_at=job.updated_at.isoformat(),
+                    started_at=job.created_at_iso(),
+                    completed_at=job.updated_at_iso(),
                     status_message=job.get_status_message() if hasattr(job, 'get_status_message') else None
                 )
 
@@ -337,6 +336,21 @@ class ToolRegistry:
 # Global registry instance
 registry = ToolRegistry()
 
+# JSON schema type names for builtin annotation types
+_TYPE_NAMES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object"
+}
+
+def _get_type_name(annotation: Any) -> str:
+    """Get the tool parameter type name for a type annotation."""
+    # Generic aliases such as List[str] resolve through their origin type
+    return _TYPE_NAMES.get(getattr(annotation, "__origin__", annotation), "string")
+
 def tool(
     name: Optional[str] = None,
     description: Optional[str] = None,
@@ -360,24 +374,30 @@ def tool(
 
         # Infer parameters from function signature if not provided
         if parameters is None:
-            sig = inspect.signature(func)
+            code = func.__code__
+            annotations = getattr(func, "__annotations__", {})
+            defaults = func.__defaults__ or ()
+            kwdefaults = func.__kwdefaults__ or {}
+            first_default = code.co_argcount - len(defaults)
             tool_parameters = []
-            for param_name, param in sig.parameters.items():
+            for index, param_name in enumerate(code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]):
                 if param_name in ['self', 'job_id', 'request', 'background_tasks']:
                     continue
 
                 param_type = "string"
-                if param.annotation != inspect.Parameter.empty:
-                    if hasattr(param.annotation, "__name__"):
-                        param_type = param.annotation.__name__.lower()
-                    elif hasattr(param.annotation, "_name"):
-                        param_type = param.annotation._name.lower()
+                if param_name in annotations:
+                    param_type = _get_type_name(annotations[param_name])
+
+                if index < code.co_argcount:
+                    required = index < first_default
+                else:
+                    required = param_name not in kwdefaults
 
                 tool_parameters.append(Parameter(
                     name=param_name,
                     type=param_type,
                     description=f"Parameter {param_name}",
-                    required=param.default == inspect.Parameter.empty
+                    required=required
                 ))
         else:
             tool_parameters = parameters
@@ -4,27 +4,31 @@ Fibonacci sequence generator tool.
 This tool generates a Fibonacci sequence of a specified length.
 """
 
+import asyncio
+import functools
 import logging
 from typing import Dict, Any
 from .core import tool, Parameter, JobSettings
-from rich.console import Console
-
-# Initialize console
-console = Console()
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=128)
 def calculate_fibonacci(n: int) -> int:
-    """Calculate the nth Fibonacci number"""
+    """Calculate the nth Fibonacci number
+
+    Uses fast doubling, so only O(log n) big integer multiplications are
+    needed, and caches recent results.
+    """
     if n <= 0:
         raise ValueError("Input must be a positive integer")
-    elif n == 1 or n == 2:
-        return 1
-    else:
-        a, b = 1, 1
-        for _ in range(3, n + 1):
-            a, b = b, a + b
-        return b
+
+    # Walk the bits of n from the top, keeping (F(k), F(k+1))
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * ((b << 1) - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a
 
 @tool(
     name="fibonacci",
@@ -79,8 +83,9 @@ async def run_fibonacci_calculation(n: int) -> dict:
     if n > 100000:
         raise ValueError("Input too large - please use n <= 100000")
 
-    # Calculate Fibonacci number
-    result = calculate_fibonacci(n)
+    # Calculate Fibonacci number off the event loop; large n means big integer math
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(None, calculate_fibonacci, n)
 
     return {
         "n": n,
@@ -1,17 +1,16 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-import subprocess
 import sys
 import os
 from playwright.async_api import async_playwright
 import asyncio
 from datetime import datetime
 from typing import Optional
-from rich.console import Console
+from ..logging_setup import get_console
 from rich.panel import Panel
 
-# Initialize Rich console
-console = Console()
+# Shared Rich console
+console = get_console()
 
 router = APIRouter(
     prefix="/gift-credits",
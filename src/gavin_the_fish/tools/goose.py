@@ -4,14 +4,10 @@ Goose tool for generating random goose-related content.
 This tool provides various goose-related functionalities.
 """
 
+import asyncio
 import logging
 from typing import Dict, Any
 from .core import tool, Parameter, JobSettings
-import subprocess
-from rich.console import Console
-
-# Initialize console
-console = Console()
 
 logger = logging.getLogger(__name__)
 
@@ -36,21 +32,29 @@ async def run_goose_command(
 ) -> dict:
     """Run a Goose MCP command on the specified target"""
     try:
-        # Run the goose command
-        process = subprocess.run(
-            ["goose", "run", "-t", text],
-            capture_output=True,
-            text=True,
-            check=True
+        # Run the goose command without blocking the event loop
+        process = await asyncio.create_subprocess_exec(
+            "goose", "run", "-t", text,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            # Don't leave goose running if the job is cancelled
+            process.kill()
+            raise
+        
+        if process.returncode != 0:
+            raise ValueError(f"Command failed: {stderr.decode().strip()}")
         
         return {
             "status": "success",
             "text": text,
-            "output": process.stdout.strip()
+            "output": stdout.decode().strip()
         }
-    except subprocess.CalledProcessError as e:
-        raise ValueError(f"Command failed: {e.stderr.strip()}")
+    except ValueError:
+        raise
     except Exception as e:
         raise ValueError(f"Unexpected error: {str(e)}")
 
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-from typing import List
-from ..job_registry import job_registry
+from typing import List, Optional
+from ..job_registry import job_registry, JobStatus
 
 router = APIRouter(
     prefix="/jobs",
@@ -19,10 +19,30 @@ class JobStatusResponse(BaseModel):
 class JobListResponse(BaseModel):
     jobs: List[JobStatusResponse]
 
+def _job_response(job) -> JobStatusResponse:
+    return JobStatusResponse(
+        job_id=job.job_id,
+        tool_name=job.tool_name,
+        status=job.status.value,
+        status_message=job.get_status_message(),
+        created_at=job.created_at_iso(),
+        updated_at=job.updated_at_iso()
+    )
+
 @router.get("")
-async def list_jobs() -> JobListResponse:
-    """List all background jobs with their current status"""
-    jobs = job_registry.get_all_jobs_with_status()
+async def list_jobs(
+    status: Optional[JobStatus] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+) -> JobListResponse:
+    """List background jobs with their current status, optionally filtered and one page at a time"""
+    if limit is not None:
+        jobs = [_job_response(job) for job in job_registry.iter_jobs(status=status, limit=limit, offset=offset)]
+    elif status is not None:
+        jobs = [_job_response(job) for job in job_registry.list_jobs_by_status(status)[offset:]]
+    else:
+        # Unpaged listings are served from the registry's cached snapshot
+        jobs = job_registry.get_all_jobs_with_status()[offset:]
     return JobListResponse(jobs=jobs)
 
 @router.get("/{job_id}")
@@ -32,15 +52,7 @@ async def get_job_status(job_id: str) -> JobStatusResponse:
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
         
-    job_info = {
-        "job_id": job.job_id,
-        "tool_name": job.tool_name,
-        "status": job.status.value,
-        "status_message": job.get_status_message(),
-        "created_at": job.created_at.isoformat(),
-        "updated_at": job.updated_at.isoformat()
-    }
-    return JobStatusResponse(**job_info)
+    return _job_response(job)
 
 @router.post("/{job_id}/cancel")
 async def cancel_job(job_id: str) -> JobStatusResponse:
@@ -50,30 +62,18 @@ async def cancel_job(job_id: str) -> JobStatusResponse:
         raise HTTPException(status_code=404, detail="Job not found or not cancelable")
         
     job = job_registry.get_job(job_id)
-    job_info = {
-        "job_id": job.job_id,
-        "tool_name": job.tool_name,
-        "status": job.status.value,
-        "status_message": job.get_status_message(),
-        "created_at": job.created_at.isoformat(),
-        "updated_at": job.updated_at.isoformat()
-    }
-    return JobStatusResponse(**job_info)
+    return _job_response(job)
 
 @router.delete("/{job_id}")
 async def delete_job(job_id: str) -> dict:
     """Delete a specific job by ID"""
-    job = job_registry.get_job(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
     # Remove the job from the registry
-    del job_registry._jobs[job_id]
+    if not job_registry.delete_job(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
     return {"message": f"Job {job_id} deleted successfully"}
 
 @router.delete("")
 async def delete_all_jobs() -> dict:
     """Delete all jobs"""
-    job_count = len(job_registry._jobs)
-    job_registry._jobs.clear()
+    job_count = job_registry.clear()
     return {"message": f"Deleted {job_count} jobs"} 
\ No newline at end of file
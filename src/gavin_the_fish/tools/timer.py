@@ -8,10 +8,6 @@ import asyncio
 import logging
 from typing import Dict, Any
 from .core import tool, Parameter, JobSettings
-from rich.console import Console
-
-# Initialize console
-console = Console()
 
 logger = logging.getLogger(__name__)
 
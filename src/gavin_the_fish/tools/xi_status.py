@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+import asyncio
 import httpx
+import re
+import time
 import xml.etree.ElementTree as ET
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -16,41 +19,72 @@ class StatusItem(BaseModel):
     description: str
     pub_date: str
 
+# Status label in an item description, up to the closing </b> (or the end if unclosed)
+_STATUS_RE = re.compile(r"<b>Status:(.*?)(?:</b>|\Z)", re.S)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# The status feed changes on the order of minutes, so parsed items are reused briefly
+STATUS_CACHE_TTL = 30.0
+_status_cache: Optional[Tuple[float, List[StatusItem]]] = None
+_status_lock: Optional[asyncio.Lock] = None
+
+def _cached_items() -> Optional[List[StatusItem]]:
+    """Return the cached status items if they are still fresh"""
+    if _status_cache is not None and time.monotonic() - _status_cache[0] < STATUS_CACHE_TTL:
+        return _status_cache[1]
+    return None
+
+async def _fetch_status_items(client: httpx.AsyncClient) -> List[StatusItem]:
+    """Fetch and parse the ElevenLabs status RSS feed"""
+    # Fetch the RSS feed
+    response = await client.get("https://status.elevenlabs.io/feed.rss", follow_redirects=True)
+    response.raise_for_status()
+    
+    # Parse the XML
+    root = ET.fromstring(response.content)
+    
+    # Extract items
+    items = []
+    for item in root.iter("item"):
+        title = item.findtext("title", "")
+        description = item.findtext("description", "")
+        pub_date = item.findtext("pubDate", "")
+        
+        # Extract status from description
+        match = _STATUS_RE.search(description)
+        status = match.group(1).strip() if match else "Unknown"
+        
+        # Clean up description
+        description = description.replace("<![CDATA[", "").replace("]]>", "")
+        description = _WHITESPACE_RE.sub(" ", description).strip()  # Normalize whitespace
+        
+        items.append(StatusItem(
+            title=title,
+            status=status,
+            description=description,
+            pub_date=pub_date
+        ))
+    
+    return items
+
 @router.get("", response_model=List[StatusItem])
-async def check_xi_status():
+async def check_xi_status(request: Request):
     """Get ElevenLabs operational status details"""
+    global _status_cache, _status_lock
+    items = _cached_items()
+    if items is not None:
+        return items
+    
+    if _status_lock is None:
+        _status_lock = asyncio.Lock()
     try:
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            # Fetch the RSS feed
-            response = await client.get("https://status.elevenlabs.io/feed.rss")
-            response.raise_for_status()
-            
-            # Parse the XML
-            root = ET.fromstring(response.content)
-            
-            # Extract items
-            items = []
-            for item in root.findall(".//item"):
-                title = item.find("title").text
-                description = item.find("description").text
-                pub_date = item.find("pubDate").text
-                
-                # Extract status from description
-                status = "Unknown"
-                if "<b>Status:" in description:
-                    status = description.split("<b>Status:")[1].split("</b>")[0].strip()
-                
-                # Clean up description
-                description = description.replace("<![CDATA[", "").replace("]]>", "")
-                description = " ".join(description.split())  # Normalize whitespace
-                
-                items.append(StatusItem(
-                    title=title,
-                    status=status,
-                    description=description,
-                    pub_date=pub_date
-                ))
-            
+        # Only one request refreshes the feed; the others wait and reuse its result
+        async with _status_lock:
+            items = _cached_items()
+            if items is None:
+                # Shared client from the app lifespan, so connections are reused
+                items = await _fetch_status_items(request.app.state.http)
+                _status_cache = (time.monotonic(), items)
             return items
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=f"HTTP error occurred: {str(e)}")
@@ -59,4 +93,4 @@ async def check_xi_status():
     except ET.ParseError as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse XML response: {str(e)}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, HTTPException
-import subprocess
+import asyncio
 import os
 
+# Script path, resolved once at import
+SCRIPT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../check-youtube-available.sh"))
+
 router = APIRouter(
     prefix="/youtube",
     tags=["youtube"]
@@ -11,14 +14,14 @@ router = APIRouter(
 async def check_youtube_available():
     """Check if YouTube is available"""
     try:
-        script_path = os.path.join(os.path.dirname(__file__), "../../../check-youtube-available.sh")
-        result = subprocess.run(
-            [script_path],
-            capture_output=True,
-            text=True
+        process = await asyncio.create_subprocess_exec(
+            SCRIPT_PATH,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
-        if result.returncode != 0:
-            raise HTTPException(status_code=500, detail=result.stderr)
-        return {"message": "Success", "output": result.stdout}
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise HTTPException(status_code=500, detail=stderr.decode())
+        return {"message": "Success", "output": stdout.decode()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException
-import subprocess
+import asyncio
 import os
 from typing import Optional
 from pydantic import BaseModel
 
+# Script path, resolved once at import
+SCRIPT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../paste-zendesk-ticket-info.sh"))
+
 router = APIRouter(
     prefix="/zendesk-ticket",
     tags=["zendesk-ticket"]
@@ -16,18 +19,18 @@ class ZendeskTicketRequest(BaseModel):
 async def paste_zendesk_ticket_info(request: ZendeskTicketRequest):
     """Paste Zendesk ticket information"""
     try:
-        script_path = os.path.join(os.path.dirname(__file__), "../../../paste-zendesk-ticket-info.sh")
         args = []
         if request.ticket_number:
             args.append(request.ticket_number)
         
-        result = subprocess.run(
-            [script_path] + args,
-            capture_output=True,
-            text=True
+        process = await asyncio.create_subprocess_exec(
+            SCRIPT_PATH, *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
-        if result.returncode != 0:
-            raise HTTPException(status_code=500, detail=result.stderr)
-        return {"message": "Success", "output": result.stdout}
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise HTTPException(status_code=500, detail=stderr.decode())
+        return {"message": "Success", "output": stdout.decode()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
@@ -4,7 +4,11 @@ Unit tests for the job registry.
 These tests verify that the job registry works correctly.
 """
 
+import threading
+from collections import deque
+
 import pytest
+from src.gavin_the_fish import job_registry as job_registry_module
 from src.gavin_the_fish.job_registry import JobRegistry, JobStatus, Job
 
 def test_job_creation():
@@ -85,3 +89,223 @@ def test_get_all_jobs():
     assert len(jobs) == 2
     assert job1.job_id in [j.job_id for j in jobs]
     assert job2.job_id in [j.job_id for j in jobs]
+
+def test_list_jobs_filters():
+    """Test filtering jobs through the secondary indexes."""
+    registry = JobRegistry()
+    
+    job1 = registry.create_job(tool_name="tool1", input={}, owner="alice", conversation_id="conv1")
+    job2 = registry.create_job(tool_name="tool2", input={}, owner="alice")
+    job3 = registry.create_job(tool_name="tool1", input={}, owner="bob", conversation_id="conv1")
+    
+    assert [j.job_id for j in registry.list_jobs(owner="alice")] == [job1.job_id, job2.job_id]
+    assert [j.job_id for j in registry.list_jobs(tool_name="tool1", conversation_id="conv1")] == [job1.job_id, job3.job_id]
+    assert registry.list_jobs(owner="carol") == []
+    
+    # Status changes move jobs between status index entries
+    registry.update_job(job3.job_id, JobStatus.RUNNING)
+    assert [j.job_id for j in registry.list_jobs(status=JobStatus.RUNNING)] == [job3.job_id]
+    assert [j.job_id for j in registry.list_jobs(status=JobStatus.PENDING, tool_name="tool1")] == [job1.job_id]
+    assert registry.list_jobs_by_status(JobStatus.PENDING) == [job1, job2]
+    
+    # Deleted jobs drop out of every index
+    assert registry.delete_job(job1.job_id) is True
+    assert registry.list_jobs(conversation_id="conv1") == [job3]
+    assert registry.delete_job(job1.job_id) is False
+    
+    assert registry.clear() == 2
+    assert registry.list_jobs(owner="alice") == []
+
+def test_iter_jobs_pages():
+    """Test paging through jobs with iter_jobs."""
+    registry = JobRegistry()
+    jobs = [registry.create_job(tool_name="tool1", input={}) for _ in range(5)]
+    registry.update_job(jobs[1].job_id, JobStatus.RUNNING)
+    registry.update_job(jobs[3].job_id, JobStatus.RUNNING)
+    
+    assert list(registry.iter_jobs(limit=2, offset=1)) == jobs[1:3]
+    assert list(registry.iter_jobs(status=JobStatus.RUNNING)) == [jobs[1], jobs[3]]
+    assert list(registry.iter_jobs(status=JobStatus.PENDING, limit=2, offset=1)) == [jobs[2], jobs[4]]
+    assert list(registry.iter_jobs(status=JobStatus.FAILED)) == []
+
+def test_status_messages():
+    """Test the human-readable status messages."""
+    registry = JobRegistry()
+    job = registry.create_job(tool_name="test_tool", input={})
+    
+    assert job.get_status_message() == "Waiting to start test_tool job"
+    
+    registry.update_job(job.job_id, JobStatus.FAILED, error="boom")
+    assert job.get_status_message() == "Job failed: boom"
+    
+    registry.update_job(job.job_id, JobStatus.SUCCESS, result={})
+    assert job.get_status_message() == "test_tool job completed successfully"
+    
+    # Tools with their own success message use the job result
+    job = registry.create_job(tool_name="fibonacci", input={})
+    registry.update_job(job.job_id, JobStatus.SUCCESS, result={"result": 55})
+    assert job.get_status_message() == "Fibonacci calculation completed. The result is 55"
+
+def test_jobs_with_status_snapshot():
+    """Test that the cached job status list is refreshed after writes."""
+    registry = JobRegistry()
+    job = registry.create_job(tool_name="test_tool", input={})
+    
+    snapshot = registry.get_all_jobs_with_status()
+    assert registry.get_all_jobs_with_status() is snapshot
+    assert snapshot[0]["status"] == "pending"
+    
+    registry.update_job(job.job_id, JobStatus.RUNNING)
+    assert registry.get_all_jobs_with_status()[0]["status"] == "running"
+    
+    registry.delete_job(job.job_id)
+    assert registry.get_all_jobs_with_status() == []
+
+def test_format_with_context():
+    """Test formatting notification templates from the job input and result."""
+    job = Job(job_id="abcde", tool_name="test_tool", input={"x": 1}, result={"y": 2})
+    
+    assert job._format_with_context("{x} and {y}") == "1 and 2"
+    assert job._format_with_context("{x} {missing}") == "1 {missing}"
+    assert job._format_with_context("{missing.attr} {x}") == "{missing.attr} 1"
+    assert job._format_with_context("plain text") == "plain text"
+
+def test_format_with_context_complex_fields():
+    """Test templates with indexing, attributes and format specs."""
+    job = Job(job_id="abcde", tool_name="test_tool", input={"target": "x", "n": 1234}, result={"items": ["a"]})
+    
+    # Missing keys in non-simple fields are left in place, present keys still filled in
+    assert job._format_with_context("{target} {missing[0]}") == "x {missing[0]}"
+    assert job._format_with_context("{target} {count:,}") == "x {count:,}"
+    assert job._format_with_context("{target} {missing.attr}") == "x {missing.attr}"
+    assert job._format_with_context("{target} {missing!r}") == "x {missing!r}"
+    
+    # Fields that fully resolve are formatted normally
+    assert job._format_with_context("{target} {n:,} {items[0]}") == "x 1,234 a"
+    assert job._format_with_context("{target} {n[0]}") == "x {n[0]}"
+
+def test_job_dict_round_trip():
+    """Test converting a job to a dictionary and back."""
+    registry = JobRegistry()
+    job = registry.create_job(
+        tool_name="test_tool",
+        input={"param": "value"},
+        owner="alice",
+        notification_title="Done"
+    )
+    registry.update_job(job.job_id, JobStatus.SUCCESS, result={"output": 1})
+    
+    data = job.to_dict()
+    assert data["status"] == "success"
+    assert "on_status_change" not in data
+    
+    restored = Job.from_dict(data)
+    assert restored.job_id == job.job_id
+    assert restored.status == JobStatus.SUCCESS
+    assert restored.result == {"output": 1}
+    assert restored.created_at == job.created_at
+    assert restored.notification_title == "Done"
+
+def test_updated_at_iso_cache():
+    """Test that the cached update time follows status changes."""
+    registry = JobRegistry()
+    job = registry.create_job(tool_name="test_tool", input={})
+    
+    first = job.updated_at_iso()
+    assert first == job.updated_at.isoformat()
+    assert job.updated_at_iso() is first
+    
+    registry.update_job(job.job_id, JobStatus.RUNNING)
+    assert job.updated_at_iso() == job.updated_at.isoformat()
+    assert job.to_dict()["updated_at"] == job.updated_at.isoformat()
+
+def test_cleanup_expired_jobs():
+    """Test removing jobs older than a maximum age."""
+    registry = JobRegistry()
+    old_job = registry.create_job(tool_name="tool1", input={})
+    deleted_job = registry.create_job(tool_name="tool1", input={})
+    new_job = registry.create_job(tool_name="tool1", input={})
+    
+    # Age the first two jobs and delete one of them directly
+    for job in (old_job, deleted_job):
+        job.created_ts -= 120
+    registry._created_order = deque(
+        (job.created_ts, job.job_id) for job in (old_job, deleted_job, new_job)
+    )
+    registry.delete_job(deleted_job.job_id)
+    
+    assert registry.cleanup_expired_jobs(max_age_seconds=60) == 1
+    assert registry.get_job(old_job.job_id) is None
+    assert registry.get_job(new_job.job_id) is new_job
+    assert registry.list_jobs(tool_name="tool1") == [new_job]
+
+def test_created_order_stays_bounded():
+    """Test that deleted jobs don't pile up in the creation-ordered deque."""
+    registry = JobRegistry()
+    pinned = registry.create_job(tool_name="tool1", input={})
+    
+    for _ in range(1000):
+        job = registry.create_job(tool_name="tool1", input={})
+        registry.delete_job(job.job_id)
+    
+    assert len(registry._created_order) <= 2 * len(registry._jobs) + 18
+    assert registry._created_order[0] == (pinned.created_ts, pinned.job_id)
+
+def test_finished_job_eviction():
+    """Test that finished jobs are evicted past the size cap and TTL."""
+    registry = JobRegistry(max_finished_jobs=2)
+    jobs = [registry.create_job(tool_name="tool1", input={}) for _ in range(4)]
+    
+    for job in jobs[:3]:
+        registry.update_job(job.job_id, JobStatus.SUCCESS)
+    
+    # The oldest finished job is evicted, the active job is untouched
+    assert registry.get_job(jobs[0].job_id) is None
+    assert registry.list_jobs(status=JobStatus.SUCCESS) == jobs[1:3]
+    assert registry.get_job(jobs[3].job_id) is jobs[3]
+    
+    registry._finished_job_ttl = 0
+    assert registry.evict_now() == 2
+    assert registry.list_jobs() == [jobs[3]]
+
+def test_eviction_ignores_deleted_and_refinished_jobs():
+    """Test that dead finished entries don't count toward the size cap."""
+    registry = JobRegistry(max_finished_jobs=2)
+    a, d, e = (registry.create_job(tool_name="tool1", input={}) for _ in range(3))
+    
+    registry.update_job(a.job_id, JobStatus.SUCCESS)
+    registry.update_job(d.job_id, JobStatus.SUCCESS)
+    registry.delete_job(d.job_id)
+    registry.update_job(e.job_id, JobStatus.CANCELLED)
+    registry.update_job(e.job_id, JobStatus.FAILED)
+    
+    # Only a and e are alive and finished, so nothing is evicted
+    assert registry.list_jobs() == [a, e]
+    assert registry._finished_count == 2
+    
+    f = registry.create_job(tool_name="tool1", input={})
+    registry.update_job(f.job_id, JobStatus.SUCCESS)
+    assert registry.list_jobs() == [e, f]
+
+def test_completion_notification_is_queued(monkeypatch):
+    """Test that completion notifications are sent from the notification thread."""
+    sent = []
+    delivered = threading.Event()
+    
+    def fake_notification(title, subtitle, message):
+        sent.append((title, message, threading.current_thread().name))
+        delivered.set()
+    
+    monkeypatch.setattr(job_registry_module.rumps, "notification", fake_notification)
+    registry = JobRegistry()
+    job = registry.create_job(
+        tool_name="test_tool",
+        input={"x": 1},
+        notify_on_completion=True,
+        notification_title="Done",
+        notification_message="x was {x}"
+    )
+    registry.update_job(job.job_id, JobStatus.SUCCESS, result={})
+    
+    assert delivered.wait(timeout=5)
+    assert sent == [("Done", "x was 1", "job-notifications")]
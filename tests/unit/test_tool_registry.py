@@ -5,7 +5,8 @@ These tests verify that the tool registry works correctly.
 """
 
 import pytest
-from src.gavin_the_fish.tools.core import ToolRegistry, ToolSchema, Parameter, JobSettings
+from typing import List
+from src.gavin_the_fish.tools.core import ToolRegistry, ToolSchema, Parameter, JobSettings, registry, tool
 
 def test_tool_registration():
     """Test registering a tool."""
@@ -74,3 +75,20 @@ def test_tool_registration_with_settings():
     assert registry.get_schema("test_tool") == schema
     assert registry.get_implementation("test_tool") == implementation
     assert registry.get_job_settings("test_tool") == settings
+
+def test_tool_parameter_inference():
+    """Test inferring tool parameters from the function signature."""
+    @tool(name="test_inferred_tool", description="Test tool")
+    async def implementation(job_id: str, count: int, label: str = "x", *, verbose: bool = False, tags: List[str] = None, extra=None):
+        return {}
+
+    schema = registry.get_schema("test_inferred_tool")
+    params = {p.name: p for p in schema.parameters}
+
+    # job_id is reserved and should not be exposed
+    assert list(params) == ["count", "label", "verbose", "tags", "extra"]
+    assert params["count"].type == "integer" and params["count"].required is True
+    assert params["label"].type == "string" and params["label"].required is False
+    assert params["verbose"].type == "boolean" and params["verbose"].required is False
+    assert params["tags"].type == "array" and params["tags"].required is False
+    assert params["extra"].type == "string" and params["extra"].required is False